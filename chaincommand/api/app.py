@@ -183,7 +183,7 @@ async def websocket_live(websocket: WebSocket):
             if not _runtime.event_bus:
                 continue
 
-            events = _runtime.event_bus.recent_events[-20:]
+            events = _runtime.event_bus.events_tail(20)
             for evt in events:
                 eid = evt.event_id
                 if eid and eid not in seen_ids_set:
@@ -37,7 +37,7 @@ async def get_kpi_history(periods: int = Query(default=30, ge=1, le=365)):
 
     if not _runtime.kpi_engine:
         return {"snapshots": [], "count": 0}
-    snapshots = _runtime.kpi_engine.history[-periods:]
+    snapshots = _runtime.kpi_engine.recent(periods)
     return {
         "snapshots": [s.model_dump() for s in snapshots],
         "count": len(snapshots),
@@ -53,9 +53,10 @@ async def get_inventory_status(product_id: Optional[str] = None):
 
     products = _runtime.products or []
     if product_id:
-        products = [p for p in products if p.product_id == product_id]
-        if not products:
+        product = _runtime.products_by_id.get(product_id)
+        if product is None:
             raise HTTPException(status_code=404, detail=f"Product '{product_id}' not found")
+        products = [product]
 
     items = []
     for p in products:
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import hmac
+import json
 import logging
 import warnings
 
@@ -76,9 +78,6 @@ async def authenticate_ws_first_message(websocket: WebSocket) -> bool:
     Returns ``True`` on success.  On failure, closes the socket and returns
     ``False``.
     """
-    import asyncio
-    import json
-
     try:
         raw = await asyncio.wait_for(websocket.receive_text(), timeout=10.0)
     except asyncio.TimeoutError:
@@ -12,6 +12,9 @@ from ..utils.logging_config import get_logger
 
 log = get_logger(__name__)
 
+_BUCKET_RE = re.compile(r'^[a-z0-9][a-z0-9.\-]{1,61}[a-z0-9]$')
+_IDENTIFIER_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_\-]*$')
+
 # ── External table DDL templates ────────────────────────
 
 CREATE_DATABASE_DDL = "CREATE DATABASE IF NOT EXISTS {database}"
@@ -108,10 +111,10 @@ class AthenaClient:
         """
         if name == "bucket":
             # S3 bucket naming rules: 3-63 chars, lowercase, digits, dots, hyphens
-            if not re.match(r'^[a-z0-9][a-z0-9.\-]{1,61}[a-z0-9]$', value):
+            if not _BUCKET_RE.match(value):
                 raise ValueError(f"Invalid {name}: {value}")
         else:
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_\-]*$', value):
+            if not _IDENTIFIER_RE.match(value):
                 raise ValueError(f"Invalid {name}: {value}")
         return value
 
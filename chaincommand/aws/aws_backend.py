@@ -20,6 +20,8 @@ from .s3_client import S3Client
 
 log = get_logger(__name__)
 
+_METRIC_RE = re.compile(r'^[a-z_]+$')
+
 
 class AWSBackend(PersistenceBackend):
     """Full AWS persistence backend using S3, Redshift, Athena, and QuickSight."""
@@ -83,11 +85,13 @@ class AWSBackend(PersistenceBackend):
         prefix = settings.aws_s3_prefix.rstrip("/")
 
         # ── S3: upload JSONL (sync boto3 calls — run off event loop) ──
+        # The uploads are independent, so they run concurrently on worker threads
         # KPI snapshot
         kpi_key = f"{prefix}/kpi_snapshots/{date_path}/cycle_{cycle}.jsonl"
-        kpi_data = kpi.model_dump()
+        # KPISnapshot is flat, so a shallow field copy equals model_dump()
+        kpi_data = dict(kpi)
         kpi_data["cycle"] = cycle
-        await asyncio.to_thread(self._s3.upload_jsonl, [kpi_data], kpi_key)
+        uploads = [asyncio.to_thread(self._s3.upload_jsonl, [kpi_data], kpi_key)]
 
         # Events
         if events:
@@ -95,7 +99,7 @@ class AWSBackend(PersistenceBackend):
             event_records = [
                 e.model_dump() if hasattr(e, "model_dump") else e for e in events
             ]
-            await asyncio.to_thread(self._s3.upload_jsonl, event_records, events_key)
+            uploads.append(asyncio.to_thread(self._s3.upload_jsonl, event_records, events_key))
 
         # Purchase orders
         if pos:
@@ -103,7 +107,9 @@ class AWSBackend(PersistenceBackend):
             po_records = [
                 p.model_dump() if hasattr(p, "model_dump") else p for p in pos
             ]
-            await asyncio.to_thread(self._s3.upload_jsonl, po_records, pos_key)
+            uploads.append(asyncio.to_thread(self._s3.upload_jsonl, po_records, pos_key))
+
+        await asyncio.gather(*uploads)
 
         # Log when products/suppliers are provided but not persisted
         if products:
@@ -145,7 +151,7 @@ class AWSBackend(PersistenceBackend):
             return []
 
         # Belt-and-suspenders: regex check even after allowlist
-        if not re.match(r'^[a-z_]+$', metric):
+        if not _METRIC_RE.match(metric):
             log.warning("query_kpi_trend_rejected_metric", metric=metric)
             return []
 
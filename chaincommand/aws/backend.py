@@ -34,7 +34,11 @@ class PersistenceBackend(ABC):
         products: list,
         suppliers: list,
     ) -> None:
-        """Persist data from one decision cycle."""
+        """Persist data from one decision cycle.
+
+        ``pos`` holds the orders created or changed since the previous cycle;
+        ``products`` and ``suppliers`` are informational only.
+        """
 
     @abstractmethod
     async def persist_demand_history(self, df: pd.DataFrame) -> None:
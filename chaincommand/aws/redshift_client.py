@@ -12,6 +12,9 @@ from ..utils.logging_config import get_logger
 
 log = get_logger(__name__)
 
+_IAM_ROLE_RE = re.compile(r'^arn:aws:iam::\d+:role/[\w+=,.@\-/]+$')
+_S3_KEY_RE = re.compile(r'^[\w./\-]+$')
+
 # ── Table DDL ────────────────────────────────────────────
 
 CREATE_KPI_SNAPSHOTS = """
@@ -124,7 +127,7 @@ class RedshiftClient:
         self._user = user or settings.aws_redshift_user
         self._password = password or settings.aws_redshift_password.get_secret_value()
         self._iam_role = iam_role or settings.aws_redshift_iam_role
-        if self._iam_role and not re.match(r'^arn:aws:iam::\d+:role/[\w+=,.@\-/]+$', self._iam_role):
+        if self._iam_role and not _IAM_ROLE_RE.match(self._iam_role):
             raise ValueError(f"Invalid IAM role ARN format: {self._iam_role}")
         self._conn: Any = None
         self._conn_lock = threading.Lock()
@@ -194,7 +197,7 @@ class RedshiftClient:
             raise ValueError(f"Invalid table: {table}")
         if file_format.upper() not in self._ALLOWED_FORMATS:
             raise ValueError(f"Invalid format: {file_format}")
-        if not re.match(r'^[\w./\-]+$', s3_key):
+        if not _S3_KEY_RE.match(s3_key):
             raise ValueError(f"Invalid S3 key: {s3_key}")
 
         format_clause = file_format.upper()
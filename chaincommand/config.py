@@ -7,6 +7,8 @@ import logging
 from pydantic import SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
+from .data.schemas import AlertSeverity
+
 _config_log = logging.getLogger(__name__)
 
 _DEFAULT_API_KEY = "dev-key-change-me"
@@ -23,6 +25,7 @@ class Settings(BaseSettings):
 
     # ── Training ──────────────────────────────────────────────
     max_train_products: int = 20
+    forecast_n_jobs: int = 1  # joblib workers for EnsembleForecaster.train_all; -1 = all cores
 
     # ── Simulation ───────────────────────────────────────
     num_products: int = 50
@@ -31,6 +34,8 @@ class Settings(BaseSettings):
     simulation_speed: float = 1.0
     simulation_speed_min: float = 0.1
     simulation_speed_max: float = 100.0
+    data_cache_dir: str = ""  # Parquet cache for generated data; empty disables
+    max_step_concurrency: int = 5  # cycle analysis steps allowed on worker threads at once
 
     # ── Event engine ─────────────────────────────────────
     event_tick_seconds: float = 5.0
@@ -43,6 +48,7 @@ class Settings(BaseSettings):
     dsi_max: float = 60.0
     dsi_min: float = 10.0
     stockout_tolerance: int = 3
+    min_event_severity: AlertSeverity = AlertSeverity.LOW  # violations below this are not raised
 
     # ── Escalation / HITL ────────────────────────────────
     cost_escalation_threshold: float = 50_000.0
@@ -81,6 +87,7 @@ class Settings(BaseSettings):
 
     # ── KPI engine ─────────────────────────────────────────
     kpi_max_history: int = 1000
+    max_po_history: int = 5000  # oldest delivered/cancelled orders are dropped beyond this; 0 = unbounded
 
     # ── ML model params ─────────────────────────────────
     lstm_hidden_size: int = 64
@@ -9,8 +9,10 @@ Incorporates ChainInsight-discovered patterns:
 
 from __future__ import annotations
 
-import random
+import hashlib
+import json
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import List, Optional, Tuple
 
 import numpy as np
@@ -22,6 +24,9 @@ from chaincommand.data.schemas import (
     ProductCategory,
     Supplier,
 )
+from chaincommand.utils.logging_config import get_logger
+
+log = get_logger(__name__)
 
 # Realistic product templates per category
 _PRODUCT_TEMPLATES = {
@@ -97,50 +102,91 @@ _SUPPLIER_NAMES = [
     "Dubai Hub Trading", "Vancouver Components",
 ]
 
+_GIFT_CATEGORIES = frozenset({ProductCategory.ELECTRONICS, ProductCategory.APPAREL})
+
+# Holiday demand multiplier range per category
+_HOLIDAY_UPLIFT = {
+    ProductCategory.ELECTRONICS: (1.3, 1.5),  # gift-oriented categories surge
+    ProductCategory.APPAREL: (1.3, 1.5),
+    ProductCategory.FOOD: (1.2, 1.4),  # holiday meals & treats
+    ProductCategory.INDUSTRIAL: (0.6, 0.8),  # factories slow down
+}
+_DEFAULT_HOLIDAY_UPLIFT = (1.1, 1.3)  # mild holiday uplift
+
+# Compact dtypes enforced before demand history is written to the Parquet cache
+_DEMAND_CACHE_DTYPES = {
+    "product_id": "category",
+    "day_of_week": "int8",
+    "month": "int8",
+}
+
+
+def make_rng(seed: int | None = None) -> np.random.Generator:
+    """Create the generator used for all synthetic data draws.
+
+    SFC64 is markedly faster than Mersenne Twister for bulk draws; defaults
+    to ``settings.random_seed`` so generation is reproducible.
+    """
+    return np.random.Generator(np.random.SFC64(settings.random_seed if seed is None else seed))
+
+
+def make_sim_rng(seed: int | None = None) -> np.random.Generator:
+    """Create the generator for simulation draws made after data generation.
+
+    Spawned from the same seed as :func:`make_rng`, so runs stay
+    reproducible, but as an independent child stream: the simulation does
+    not replay the bits that produced the catalogue and demand history.
+    """
+    root = np.random.SeedSequence(settings.random_seed if seed is None else seed)
+    return np.random.Generator(np.random.SFC64(root.spawn(1)[0]))
+
 
 def generate_products(
     n: int | None = None,
-    rng: Optional[random.Random] = None,
+    rng: Optional[np.random.Generator] = None,
 ) -> List[Product]:
     """Generate a list of synthetic products."""
     n = n or settings.num_products
-    rng = rng or random.Random()
-    products = []
+    rng = rng if rng is not None else make_rng()
     categories = list(ProductCategory)
 
+    lead_times = rng.integers(3, 22, size=n)
+    demand_avg = rng.uniform(10, 200, size=n)
+    demand_std = demand_avg * rng.uniform(0.15, 0.45, size=n)
+    # ChainInsight: 2.2x overstock pattern — some products over-stocked
+    overstock_factor = np.where(rng.random(n) < 0.3, 2.2, 1.0)
+    cost_jitter = rng.uniform(0.9, 1.1, size=n)
+    price_jitter = rng.uniform(0.95, 1.05, size=n)
+    min_order_qty = rng.choice([50, 100, 200, 500], size=n)
+
+    safety_stock = demand_std * np.sqrt(lead_times) * 1.65
+    reorder_point = demand_avg * lead_times + safety_stock
+    current_stock = demand_avg * lead_times * overstock_factor
+
+    products = []
     for i in range(n):
         cat = categories[i % len(categories)]
         templates = _PRODUCT_TEMPLATES[cat]
-        tmpl = templates[i % len(templates)]
-        name, unit_cost, selling_price = tmpl
+        name, unit_cost, selling_price = templates[i % len(templates)]
 
         # Add variant suffix for duplicates
         variant = i // len(templates)
         if variant > 0:
             name = f"{name} v{variant + 1}"
 
-        lead_time = rng.randint(3, 21)
-        daily_demand_avg = rng.uniform(10, 200)
-        daily_demand_std = daily_demand_avg * rng.uniform(0.15, 0.45)
-
-        # ChainInsight: 2.2x overstock pattern — some products over-stocked
-        overstock_factor = 2.2 if rng.random() < 0.3 else 1.0
-        safety_stock = daily_demand_std * np.sqrt(lead_time) * 1.65
-        reorder_point = daily_demand_avg * lead_time + safety_stock
-
         products.append(Product(
             product_id=f"PRD-{i + 1:04d}",
             name=name,
             category=cat,
-            unit_cost=unit_cost * rng.uniform(0.9, 1.1),
-            selling_price=selling_price * rng.uniform(0.95, 1.05),
-            lead_time_days=lead_time,
-            min_order_qty=rng.choice([50, 100, 200, 500]),
-            current_stock=daily_demand_avg * lead_time * overstock_factor,
-            reorder_point=reorder_point,
-            safety_stock=safety_stock,
-            daily_demand_avg=daily_demand_avg,
-            daily_demand_std=daily_demand_std,
+            unit_cost=unit_cost * float(cost_jitter[i]),
+            selling_price=selling_price * float(price_jitter[i]),
+            lead_time_days=int(lead_times[i]),
+            min_order_qty=int(min_order_qty[i]),
+            current_stock=float(current_stock[i]),
+            reorder_point=float(reorder_point[i]),
+            safety_stock=float(safety_stock[i]),
+            daily_demand_avg=float(demand_avg[i]),
+            daily_demand_std=float(demand_std[i]),
         ))
 
     return products
@@ -148,30 +194,37 @@ def generate_products(
 
 def generate_suppliers(
     n: int | None = None,
-    rng: Optional[random.Random] = None,
+    rng: Optional[np.random.Generator] = None,
 ) -> List[Supplier]:
     """Generate a list of synthetic suppliers."""
     n = n or settings.num_suppliers
-    rng = rng or random.Random()
-    suppliers = []
+    rng = rng if rng is not None else make_rng()
+
+    reliability = np.round(np.clip(rng.normal(0.85, 0.1, size=n), 0.5, 0.99), 3)
+    lead_time_mean = rng.uniform(3, 14, size=n)
+    lead_time_std = rng.uniform(0.5, 4, size=n)
+    cost_multiplier = rng.uniform(0.85, 1.25, size=n)
+    capacity = rng.uniform(5000, 50000, size=n)
+    defect_rate = np.round(np.clip(rng.normal(0.02, 0.01, size=n), 0.001, 0.1), 4)
+    on_time_rate = np.round(np.clip(rng.normal(0.9, 0.08, size=n), 0.6, 0.99), 3)
 
+    suppliers = []
     for i in range(n):
         name = _SUPPLIER_NAMES[i % len(_SUPPLIER_NAMES)]
         variant = i // len(_SUPPLIER_NAMES)
         if variant > 0:
             name = f"{name} #{variant + 1}"
 
-        reliability = np.clip(rng.gauss(0.85, 0.1), 0.5, 0.99)
         suppliers.append(Supplier(
             supplier_id=f"SUP-{i + 1:04d}",
             name=name,
-            reliability_score=round(reliability, 3),
-            lead_time_mean=rng.uniform(3, 14),
-            lead_time_std=rng.uniform(0.5, 4),
-            cost_multiplier=rng.uniform(0.85, 1.25),
-            capacity=rng.uniform(5000, 50000),
-            defect_rate=round(np.clip(rng.gauss(0.02, 0.01), 0.001, 0.1), 4),
-            on_time_rate=round(np.clip(rng.gauss(0.9, 0.08), 0.6, 0.99), 3),
+            reliability_score=float(reliability[i]),
+            lead_time_mean=float(lead_time_mean[i]),
+            lead_time_std=float(lead_time_std[i]),
+            cost_multiplier=float(cost_multiplier[i]),
+            capacity=float(capacity[i]),
+            defect_rate=float(defect_rate[i]),
+            on_time_rate=float(on_time_rate[i]),
         ))
 
     return suppliers
@@ -180,23 +233,33 @@ def generate_suppliers(
 def assign_suppliers(
     products: List[Product],
     suppliers: List[Supplier],
-    rng: Optional[random.Random] = None,
+    rng: Optional[np.random.Generator] = None,
 ) -> List[Supplier]:
     """Assign each product to 1-3 suppliers."""
-    rng = rng or random.Random()
-    for product in products:
-        n_suppliers = rng.randint(1, min(3, len(suppliers)))
-        chosen = rng.sample(suppliers, n_suppliers)
-        for s in chosen:
-            if product.product_id not in s.products:
-                s.products.append(product.product_id)
+    if not products or not suppliers:
+        return suppliers
+    rng = rng if rng is not None else make_rng()
+    n_sup = len(suppliers)
+    max_k = min(3, n_sup)
+
+    counts = rng.integers(1, max_k + 1, size=len(products))
+    # Random-key shuffle per row: the first max_k columns are a sample without replacement
+    picks = np.argsort(rng.random((len(products), n_sup)), axis=1)[:, :max_k]
+
+    # Ordered dicts give O(1) dedup while keeping insertion order of product ids
+    assigned = [dict.fromkeys(s.products) for s in suppliers]
+    for product, row, k in zip(products, picks.tolist(), counts.tolist(), strict=True):
+        for idx in row[:k]:
+            assigned[idx][product.product_id] = None
+    for s, pids in zip(suppliers, assigned, strict=True):
+        s.products = list(pids)
     return suppliers
 
 
 def generate_demand_history(
     products: List[Product],
     days: int | None = None,
-    rng: Optional[random.Random] = None,
+    rng: Optional[np.random.Generator] = None,
 ) -> pd.DataFrame:
     """Generate daily demand history with realistic patterns.
 
@@ -209,79 +272,128 @@ def generate_demand_history(
     - Noise
     """
     days = days or settings.history_days
-    rng = rng or random.Random()
+    rng = rng if rng is not None else make_rng()
     end_date = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
     start_date = end_date - timedelta(days=days)
     dates = pd.date_range(start_date, end_date, freq="D")
-
-    records: list[dict] = []
-    for product in products:
-        avg = product.daily_demand_avg
-        std = product.daily_demand_std
-        trend_slope = rng.uniform(-0.05, 0.15)  # slight upward trend usually
-
-        for i, date in enumerate(dates):
-            # Weekly pattern (weekend dip)
-            dow = date.dayofweek
-            weekly_factor = 1.0 if dow < 5 else 0.7
-
-            # Monthly pattern
-            monthly_factor = 1.0 + 0.1 * np.sin(2 * np.pi * date.day / 30)
-
-            # Annual seasonality (Q4 spike for electronics/apparel)
-            annual_factor = 1.0
-            if product.category in (ProductCategory.ELECTRONICS, ProductCategory.APPAREL):
-                if date.month in (11, 12):
-                    annual_factor = 1.5
-                elif date.month in (1, 2):
-                    annual_factor = 0.8
-
-            # Trend
-            trend = 1.0 + trend_slope * (i / days)
-
-            # Promotion spike
-            is_promo = rng.random() < 0.05
-            promo_factor = rng.uniform(1.5, 3.0) if is_promo else 1.0
-
-            # Holiday — demand varies by category
-            is_holiday = date.month == 12 and date.day in range(20, 32)
-            if is_holiday:
-                if product.category in (ProductCategory.ELECTRONICS, ProductCategory.APPAREL):
-                    holiday_factor = rng.uniform(1.3, 1.5)  # gift-oriented categories surge
-                elif product.category == ProductCategory.FOOD:
-                    holiday_factor = rng.uniform(1.2, 1.4)  # holiday meals & treats
-                elif product.category == ProductCategory.INDUSTRIAL:
-                    holiday_factor = rng.uniform(0.6, 0.8)  # factories slow down
-                else:
-                    holiday_factor = rng.uniform(1.1, 1.3)  # mild holiday uplift
-            else:
-                holiday_factor = 1.0
-
-            # Combine
-            base = avg * weekly_factor * monthly_factor * annual_factor * trend * promo_factor * holiday_factor
-            noise = rng.gauss(0, std)
-            quantity = max(0, base + noise)
-
-            records.append({
-                "date": date,
-                "product_id": product.product_id,
-                "quantity": round(quantity, 1),
-                "is_promotion": is_promo,
-                "is_holiday": is_holiday,
-                "temperature": round(15 + 10 * np.sin(2 * np.pi * (date.timetuple().tm_yday - 80) / 365), 1),
-                "day_of_week": dow,
-                "month": date.month,
-            })
-
-    return pd.DataFrame(records)
+    n_days = len(dates)
+    n_products = len(products)
+    shape = (n_products, n_days)
+
+    # Calendar fields extracted once as arrays — no per-day Timestamp boxing
+    dow_arr = dates.dayofweek.to_numpy(dtype=np.int8)
+    day_arr = dates.day.to_numpy(dtype=np.int8)
+    month_arr = dates.month.to_numpy(dtype=np.int8)
+    yday_arr = dates.dayofyear.to_numpy(dtype=np.int16)
+
+    # Date-only factors are shared by every product
+    weekly_factor = np.where(dow_arr < 5, 1.0, 0.7)  # weekend dip
+    monthly_factor = 1.0 + 0.1 * np.sin(2 * np.pi * day_arr / 30)
+    # Annual seasonality (Q4 spike for electronics/apparel)
+    gift_annual_factor = np.select([np.isin(month_arr, (11, 12)), np.isin(month_arr, (1, 2))], [1.5, 0.8], 1.0)
+    holiday_mask = (month_arr == 12) & (day_arr >= 20)
+    temperature = np.round(15 + 10 * np.sin(2 * np.pi * (yday_arr - 80) / 365), 1)
+    trend_pos = np.arange(n_days) / days
+
+    # Per-product parameters as column vectors (products x 1) for broadcasting
+    avg = np.array([p.daily_demand_avg for p in products], dtype=np.float64)[:, None]
+    std = np.array([p.daily_demand_std for p in products], dtype=np.float64)[:, None]
+    is_gift = np.array([p.category in _GIFT_CATEGORIES for p in products], dtype=bool)[:, None]
+    uplift = np.array(
+        [_HOLIDAY_UPLIFT.get(p.category, _DEFAULT_HOLIDAY_UPLIFT) for p in products], dtype=np.float64,
+    ).reshape(n_products, 2)
+    trend_slope = rng.uniform(-0.05, 0.15, size=(n_products, 1))  # slight upward trend usually
+
+    seasonal = avg * weekly_factor * monthly_factor * (1.0 + trend_slope * trend_pos)
+    seasonal = np.where(is_gift, seasonal * gift_annual_factor, seasonal)
+
+    # Promotion spike
+    is_promo = rng.random(shape) < 0.05
+    shock = np.where(is_promo, rng.uniform(1.5, 3.0, size=shape), 1.0)
+    # Holiday — demand varies by category
+    holiday_factor = rng.uniform(uplift[:, :1], uplift[:, 1:], size=shape)
+    shock = np.where(holiday_mask, shock * holiday_factor, shock)
+
+    quantity = seasonal * shock + rng.normal(0.0, std, size=shape)
+    quantity = np.ascontiguousarray(np.round(np.maximum(quantity, 0), 1).ravel())
+
+    return pd.DataFrame({
+        "date": dates[np.tile(np.arange(n_days), n_products)],
+        "product_id": np.repeat([p.product_id for p in products], n_days),
+        "quantity": quantity,
+        "is_promotion": is_promo.ravel(),
+        "is_holiday": np.tile(holiday_mask, n_products),
+        "temperature": np.tile(temperature, n_products),
+        "day_of_week": np.tile(dow_arr, n_products),
+        "month": np.tile(month_arr, n_products),
+    })
 
 
 def generate_all(
-    rng: Optional[random.Random] = None,
+    rng: Optional[np.random.Generator] = None,
 ) -> Tuple[List[Product], List[Supplier], pd.DataFrame]:
     """Generate complete synthetic dataset."""
+    rng = rng if rng is not None else make_rng()
     products = generate_products(rng=rng)
     suppliers = generate_suppliers(rng=rng)
     suppliers = assign_suppliers(products, suppliers, rng=rng)
     demand_df = generate_demand_history(products, rng=rng)
     return products, suppliers, demand_df
+
+
+def _cache_key(seed: int) -> str:
+    """Key the data cache on generation parameters and the history end date."""
+    end_date = datetime.now(UTC).date().isoformat()
+    raw = f"{settings.num_products},{settings.num_suppliers},{settings.history_days},{seed},{end_date}"
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def generate_all_cached(
+    seed: int,
+    cache_dir: str | Path | None = None,
+) -> Tuple[List[Product], List[Supplier], pd.DataFrame]:
+    """Load the synthetic dataset from the Parquet cache, generating it on a miss.
+
+    Demand history is stored as zstd-compressed Parquet with compact dtypes;
+    products and suppliers are stored alongside as JSON. Falls back to plain
+    generation when no cache directory is configured or pyarrow is missing.
+    """
+    rng = make_rng(seed)
+    cache_dir = cache_dir or settings.data_cache_dir
+    if not cache_dir:
+        return generate_all(rng=rng)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        log.info("data_cache_unavailable", reason="pyarrow not installed")
+        return generate_all(rng=rng)
+
+    root = Path(cache_dir).expanduser()
+    key = _cache_key(seed)
+    df_path = root / f"{key}.parquet"
+    meta_path = root / f"{key}.json"
+
+    if df_path.exists() and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text())
+            products = [Product.model_validate(p) for p in meta["products"]]
+            suppliers = [Supplier.model_validate(s) for s in meta["suppliers"]]
+            demand_df = pd.read_parquet(df_path, engine="pyarrow")
+            log.info("data_cache_hit", key=key, rows=len(demand_df))
+            return products, suppliers, demand_df
+        except (OSError, ValueError, KeyError) as exc:
+            log.warning("data_cache_unreadable", key=key, error=str(exc))
+
+    products, suppliers, demand_df = generate_all(rng=rng)
+    demand_df = demand_df.astype(_DEMAND_CACHE_DTYPES)
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        demand_df.to_parquet(df_path, engine="pyarrow", compression="zstd", index=False)
+        meta_path.write_text(json.dumps({
+            "products": [p.model_dump(mode="json") for p in products],
+            "suppliers": [s.model_dump(mode="json") for s in suppliers],
+        }))
+        log.info("data_cache_written", key=key, rows=len(demand_df))
+    except OSError as exc:
+        log.warning("data_cache_write_failed", key=key, error=str(exc))
+    return products, suppliers, demand_df
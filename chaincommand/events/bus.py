@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-import itertools
 from collections import defaultdict
-from typing import Any, Callable, Coroutine, Dict, List
+from typing import Any, Callable, Coroutine, Dict, List, Sequence
 
 from ..data.schemas import SupplyChainEvent
 from ..utils.logging_config import get_logger
@@ -22,7 +21,9 @@ class EventBus:
 
     def __init__(self) -> None:
         self._subscribers: Dict[str, List[Handler]] = defaultdict(list)
-        self._all_subscribers: List[Handler] = []  # subscribe to all events
+        # Wildcard handlers; replaced rather than mutated, so a dispatch in
+        # progress keeps iterating the tuple it started with
+        self._all_subscribers: tuple[Handler, ...] = ()
         self._event_log: List[SupplyChainEvent] = []
         self._queue: asyncio.Queue[SupplyChainEvent] = asyncio.Queue()
         self._running = False
@@ -51,35 +52,62 @@ class EventBus:
 
         No-op if the handler is not subscribed.
         """
-        try:
-            self._all_subscribers.remove(handler)
-        except ValueError:
-            pass
+        if handler in self._all_subscribers:
+            remaining = list(self._all_subscribers)
+            remaining.remove(handler)
+            self._all_subscribers = tuple(remaining)
 
     def subscribe_all(self, handler: Handler) -> None:
         """Subscribe a handler to ALL events."""
-        self._all_subscribers.append(handler)
+        self._all_subscribers = (*self._all_subscribers, handler)
+
+    def has_subscribers(self, event_type: str) -> bool:
+        """Return True if publishing ``event_type`` would reach any handler."""
+        return bool(self._all_subscribers) or bool(self._subscribers.get(event_type))
 
     async def publish(self, event: SupplyChainEvent) -> None:
         """Publish an event. Dispatches to matching subscribers."""
-        self._event_log.append(event)
-        if len(self._event_log) > MAX_EVENT_LOG_SIZE:
-            del self._event_log[:len(self._event_log) - MAX_EVENT_LOG_SIZE]
-        log.info(
-            "event_published",
-            event_type=event.event_type,
-            severity=event.severity.value,
-            source=event.source_agent,
-        )
-
-        # Dispatch to type-specific + wildcard subscribers (avoids temp list copy)
-        handlers = self._subscribers.get(event.event_type, [])
-        all_handlers = itertools.chain(handlers, self._all_subscribers)
-
-        tasks = [self._safe_dispatch(h, event) for h in all_handlers]
+        await self.publish_many((event,))
+
+    async def publish_many(self, events: Sequence[SupplyChainEvent]) -> None:
+        """Publish several events, dispatching all of their handlers together.
+
+        Subscribers are looked up once per event type and every handler call
+        runs in a single gather, instead of one round-trip per event.
+        """
+        if not events:
+            return
+        self._record(events)
+
+        # Dispatch to type-specific + wildcard subscribers; every call goes
+        # through _safe_dispatch so a failing handler cannot affect the others
+        all_subscribers = self._all_subscribers
+        handlers_by_type: Dict[str, List[Handler]] = {}
+        tasks = []
+        for event in events:
+            log.info(
+                "event_published",
+                event_type=event.event_type,
+                severity=event.severity.value,
+                source=event.source_agent,
+            )
+            handlers = handlers_by_type.get(event.event_type)
+            if handlers is None:
+                handlers = [*self._subscribers.get(event.event_type, []), *all_subscribers]
+                handlers_by_type[event.event_type] = handlers
+            tasks.extend(self._safe_dispatch(h, event) for h in handlers)
         if tasks:
             await asyncio.gather(*tasks)
 
+    def record(self, event: SupplyChainEvent) -> None:
+        """Add an event to the event log without dispatching it to subscribers."""
+        self._record((event,))
+
+    def _record(self, events: Sequence[SupplyChainEvent]) -> None:
+        self._event_log.extend(events)
+        if len(self._event_log) > MAX_EVENT_LOG_SIZE:
+            del self._event_log[:len(self._event_log) - MAX_EVENT_LOG_SIZE]
+
     async def _safe_dispatch(self, handler: Handler, event: SupplyChainEvent) -> None:
         """Dispatch with error isolation."""
         try:
@@ -144,6 +172,10 @@ class EventBus:
         """Return the last 100 events."""
         return self._event_log[-100:]
 
+    def events_tail(self, n: int) -> List[SupplyChainEvent]:
+        """Return the last ``n`` events as a new list (a single slice copy)."""
+        return self._event_log[-n:] if n > 0 else []
+
     @property
     def event_count(self) -> int:
         return len(self._event_log)
@@ -7,7 +7,7 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from ..config import settings
-from ..data.schemas import AlertSeverity, SupplyChainEvent, ensure_utc
+from ..data.schemas import AlertSeverity, OrderStatus, SupplyChainEvent, ensure_utc
 from ..utils.logging_config import get_logger
 
 if TYPE_CHECKING:
@@ -22,6 +22,9 @@ _ensure_utc = ensure_utc
 
 _ALERT_COOLDOWN_SECONDS = 15 * 60  # 15 minutes
 
+# PO statuses that can still be delayed (compared as enum members, not strings)
+_ACTIVE_STATUSES = frozenset({OrderStatus.PENDING, OrderStatus.APPROVED, OrderStatus.SHIPPED})
+
 
 class ProactiveMonitor:
     """Scans system state every tick and emits alerts.
@@ -53,9 +56,13 @@ class ProactiveMonitor:
         # (entity_id, alert_type) -> last fire timestamp
         self._recent_alerts: dict[tuple[str, str], datetime] = {}
 
-    def _should_fire(self, entity_id: str, alert_type: str) -> bool:
-        """Return True if this alert hasn't been fired within the cooldown window."""
-        now = datetime.now(UTC)
+    def _should_fire(self, entity_id: str, alert_type: str, now: datetime | None = None) -> bool:
+        """Return True if this alert hasn't been fired within the cooldown window.
+
+        ``now`` lets callers scanning many entities share one timestamp per tick.
+        """
+        if now is None:
+            now = datetime.now(UTC)
         key = (entity_id, alert_type)
         last = self._recent_alerts.get(key)
         if last is not None:
@@ -106,13 +113,16 @@ class ProactiveMonitor:
         from ..orchestrator import _runtime
 
         self._tick_count += 1
+        now = datetime.now(UTC)
         products = _runtime.products or []
-        purchase_orders = _runtime.purchase_orders or []
+        # Snapshot: publishing below yields to the orchestrator, which appends
+        # to and trims the live deque
+        purchase_orders = tuple(_runtime.purchase_orders or ())
 
         # ── 1. Low inventory alerts ──────────────────────────
         for p in products:
             if p.current_stock <= 0:
-                if self._should_fire(p.product_id, "stockout_alert"):
+                if self._should_fire(p.product_id, "stockout_alert", now):
                     await self._bus.publish(SupplyChainEvent(
                         event_type="stockout_alert",
                         severity=AlertSeverity.CRITICAL,
@@ -121,7 +131,7 @@ class ProactiveMonitor:
                         data={"product_id": p.product_id, "current_stock": p.current_stock},
                     ))
             elif p.current_stock < p.safety_stock:
-                if self._should_fire(p.product_id, "low_stock_alert"):
+                if self._should_fire(p.product_id, "low_stock_alert", now):
                     await self._bus.publish(SupplyChainEvent(
                         event_type="low_stock_alert",
                         severity=AlertSeverity.HIGH,
@@ -137,7 +147,7 @@ class ProactiveMonitor:
                         },
                     ))
             elif p.current_stock > p.reorder_point * 3:
-                if self._should_fire(p.product_id, "overstock_alert"):
+                if self._should_fire(p.product_id, "overstock_alert", now):
                     await self._bus.publish(SupplyChainEvent(
                         event_type="overstock_alert",
                         severity=AlertSeverity.MEDIUM,
@@ -167,19 +177,19 @@ class ProactiveMonitor:
                 severity=AlertSeverity.LOW,
                 source_agent="monitor",
                 description="KPI snapshot calculated",
-                data=snapshot.model_dump(),
+                # KPISnapshot is flat, so a shallow field copy equals model_dump()
+                # without running the serializer on every KPI tick.
+                data=dict(snapshot),
             ))
 
         # ── 3. Delivery delay alerts ─────────────────────────
-        now = datetime.now(UTC)
         for po in purchase_orders:
-            if (
-                po.status.value in ("pending", "approved", "shipped")
-                and po.expected_delivery
-                and _ensure_utc(po.expected_delivery) < now
-            ):
-                delay_days = (now - _ensure_utc(po.expected_delivery)).days
-                if self._should_fire(po.po_id, "delivery_delayed"):
+            if po.status not in _ACTIVE_STATUSES or not po.expected_delivery:
+                continue
+            eta = _ensure_utc(po.expected_delivery)
+            if eta < now:
+                delay_days = (now - eta).days
+                if self._should_fire(po.po_id, "delivery_delayed", now):
                     await self._bus.publish(SupplyChainEvent(
                         event_type="delivery_delayed",
                         severity=AlertSeverity.HIGH if delay_days > 3 else AlertSeverity.MEDIUM,
@@ -201,7 +211,7 @@ class ProactiveMonitor:
             anomalies = self._anomaly.detect_batch(products[:10])
             for anomaly in anomalies:
                 entity = getattr(anomaly, "product_id", None) or anomaly.anomaly_id
-                if self._should_fire(entity, "anomaly_detected"):
+                if self._should_fire(entity, "anomaly_detected", now):
                     await self._bus.publish(SupplyChainEvent(
                         event_type="anomaly_detected",
                         severity=anomaly.severity,
@@ -211,13 +221,20 @@ class ProactiveMonitor:
                     ))
 
         # ── Tick event (for agents that act every tick) ──────
-        await self._bus.publish(SupplyChainEvent(
+        # The event log feeds /events/recent, the WebSocket feed and the S3
+        # events upload, so the tick is always recorded; it is only
+        # dispatched (and logged) when a handler listens for it.
+        tick_event = SupplyChainEvent(
             event_type="tick",
             severity=AlertSeverity.LOW,
             source_agent="monitor",
             description=f"Monitor tick #{self._tick_count}",
             data={"tick": self._tick_count},
-        ))
+        )
+        if self._bus.has_subscribers("tick"):
+            await self._bus.publish(tick_event)
+        else:
+            self._bus.record(tick_event)
 
     async def stop(self) -> None:
         self._running = False
@@ -0,0 +1,65 @@
+"""Fused KPI reduction kernels.
+
+Compiled with Numba when it is installed; otherwise an equivalent NumPy
+implementation is used so the engine runs without the optional dependency.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _reduce_kpis_loop(stock, demand, cost):
+    """Single sweep over the product arrays accumulating every KPI sum.
+
+    Returns (total_demand, fulfilled, total_stock, stockout_count,
+    total_value, demand_cost, backordered).
+    """
+    total_demand = 0.0
+    fulfilled = 0.0
+    total_stock = 0.0
+    total_value = 0.0
+    demand_cost = 0.0
+    stockouts = 0
+    backordered = 0
+    for i in range(stock.shape[0]):
+        s = stock[i]
+        d = demand[i]
+        c = cost[i]
+        total_demand += d
+        fulfilled += min(s, d)
+        total_stock += s
+        total_value += s * c
+        demand_cost += d * c
+        if s <= 0:
+            stockouts += 1
+            if d > 0:
+                backordered += 1
+    return total_demand, fulfilled, total_stock, stockouts, total_value, demand_cost, backordered
+
+
+def _reduce_kpis_numpy(stock, demand, cost):
+    """NumPy fallback: one vectorized reduction per KPI sum."""
+    out_of_stock = stock <= 0
+    return (
+        float(demand.sum()),
+        float(np.minimum(stock, demand).sum()),
+        float(stock.sum()),
+        int(np.count_nonzero(out_of_stock)),
+        float(stock @ cost),
+        float(demand @ cost),
+        int(np.count_nonzero(out_of_stock & (demand > 0))),
+    )
+
+
+if HAS_NUMBA:
+    reduce_kpis = njit(cache=True, fastmath=True)(_reduce_kpis_loop)
+else:
+    reduce_kpis = _reduce_kpis_numpy
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Optional
+import operator
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
 
 import numpy as np
 
@@ -19,6 +22,7 @@ from ..data.schemas import (
     ensure_utc,
 )
 from ..utils.logging_config import get_logger
+from ._kernels import reduce_kpis
 
 log = get_logger(__name__)
 
@@ -34,46 +38,92 @@ ALLOWED_KPI_METRICS: frozenset[str] = frozenset({
 # Use the canonical ensure_utc from schemas
 _ensure_utc = ensure_utc
 
+# Lowest to highest; check_thresholds slices from settings.min_event_severity
+_SEVERITY_ORDER: tuple[AlertSeverity, ...] = tuple(AlertSeverity)
+
+
+def _linear_slope(x: Any, y: Any) -> float:
+    """Least-squares slope of y on x (closed form; same result as polyfit degree 1)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    dx = x - x.mean()
+    denom = float(dx @ dx)
+    return float(dx @ (y - y.mean())) / denom if denom else 0.0
+
+
+def _gather(products: List[Product], attr: str) -> np.ndarray:
+    """Gather one numeric product attribute into a contiguous float64 array."""
+    return np.fromiter((getattr(p, attr) for p in products), dtype=np.float64, count=len(products))
+
 
 class KPIEngine:
     """Calculates KPI snapshots and checks threshold violations."""
 
+    __slots__ = ("_history", "_soa_products", "_soa_demand", "_soa_cost")
+
     def __init__(self) -> None:
-        self._history: List[KPISnapshot] = []
+        self._history: deque[KPISnapshot] = deque(maxlen=settings.kpi_max_history)
+        # Structure-of-arrays cache for the product catalog. Only current_stock
+        # changes between cycles, so demand and unit cost are reused for as long
+        # as the same Product objects are passed in.
+        self._soa_products: List[Product] = []
+        self._soa_demand = np.empty(0)
+        self._soa_cost = np.empty(0)
+
+    def _product_arrays(self, products: List[Product]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (stock, demand, cost) arrays, rebuilding static columns only on catalog change."""
+        cached = self._soa_products
+        if len(cached) != len(products) or not all(map(operator.is_, cached, products)):
+            self._soa_products = list(products)
+            self._soa_demand = _gather(products, "daily_demand_avg")
+            self._soa_cost = _gather(products, "unit_cost")
+        return _gather(products, "current_stock"), self._soa_demand, self._soa_cost
 
     def calculate_snapshot(
         self,
         products: List[Product],
-        purchase_orders: List[PurchaseOrder],
+        purchase_orders: Iterable[PurchaseOrder],
         suppliers: List[Supplier],
         forecaster: Optional[Any] = None,
     ) -> KPISnapshot:
         """Compute a full KPI snapshot from current system state."""
-
-        # ── OTIF (On-Time In-Full) ──────────────────────────
-        delivered = [po for po in purchase_orders if po.status == OrderStatus.DELIVERED]
-        on_time_in_full = 0
-        for po in delivered:
+        stock, demand, cost = self._product_arrays(products)
+        (
+            total_demand, fulfilled, total_stock, stockout_count,
+            total_value, demand_cost, backordered,
+        ) = reduce_kpis(stock, demand, cost)
+
+        # ── Purchase orders (one pass feeds OTIF, cycle time, perfect rate) ──
+        # First supplier wins on duplicate IDs, matching the old linear scan
+        lead_time_by_supplier = {s.supplier_id: s.lead_time_mean for s in reversed(suppliers)}
+        total_orders = delivered_count = on_time_in_full = perfect = cycle_count = 0
+        cycle_days_sum = 0.0
+        for po in purchase_orders:
+            status = po.status
+            if status != OrderStatus.CANCELLED:
+                total_orders += 1
+            if status != OrderStatus.DELIVERED:
+                continue
+            delivered_count += 1
+            if po.quantity > 0:  # simplified: delivered = "perfect"
+                perfect += 1
             if po.expected_delivery and po.created_at:
-                # Compare actual delivery window vs expected delivery date
-                expected = _ensure_utc(po.expected_delivery)
-                created = _ensure_utc(po.created_at)
-                expected_lead = (expected - created).total_seconds() / 86400
-                # Look up actual supplier lead time for realistic check
-                supplier = next(
-                    (s for s in suppliers if s.supplier_id == po.supplier_id), None
-                )
-                actual_lead = supplier.lead_time_mean if supplier else expected_lead
-                # On-time if actual lead time does not exceed expected by more than 1 day
+                # Promised lead time doubles as the order cycle time
+                expected_lead = (
+                    _ensure_utc(po.expected_delivery) - _ensure_utc(po.created_at)
+                ).total_seconds() / 86400
+                cycle_days_sum += expected_lead
+                cycle_count += 1
+                # On-time if the supplier's actual lead time does not exceed
+                # the promised one by more than 1 day
+                actual_lead = lead_time_by_supplier.get(po.supplier_id, expected_lead)
                 if actual_lead <= expected_lead + 1.0:
                     on_time_in_full += 1
-        otif = on_time_in_full / max(len(delivered), 1)
+
+        # ── OTIF (On-Time In-Full) ──────────────────────────
+        otif = on_time_in_full / max(delivered_count, 1)
 
         # ── Fill Rate ───────────────────────────────────────
-        total_demand = sum(p.daily_demand_avg for p in products)
-        fulfilled = sum(
-            min(p.current_stock, p.daily_demand_avg) for p in products
-        )
         fill_rate = fulfilled / max(total_demand, 1)
 
         # ── MAPE (from forecaster if available) ─────────────
@@ -89,7 +139,7 @@ class KPIEngine:
                         if predicted is not None and predicted > 0:
                             forecast_errors.append(abs(actual - predicted) / actual * 100)
                 if forecast_errors:
-                    mape = float(np.mean(forecast_errors))
+                    mape = sum(forecast_errors) / len(forecast_errors)
             except Exception:
                 log.debug("mape_calculation_fallback", reason="forecaster_error")
                 mape = self._history[-1].mape if self._history else None
@@ -97,56 +147,30 @@ class KPIEngine:
             mape = self._history[-1].mape
 
         # ── DSI (Days Sales of Inventory) ──────────────────
-        total_stock = sum(p.current_stock for p in products)
-        avg_daily = sum(p.daily_demand_avg for p in products)
-        dsi = total_stock / max(avg_daily, 1)
-
-        # ── Stockout Count ─────────────────────────────────
-        stockout_count = sum(
-            1 for p in products if p.current_stock <= 0
-        )
-
-        # ── Total Inventory Value ──────────────────────────
-        total_value = sum(p.current_stock * p.unit_cost for p in products)
+        dsi = total_stock / max(total_demand, 1)
 
         # ── Carrying Cost (annual 25% of inventory value, daily) ──
         carrying_cost = total_value * 0.25 / 365
 
         # ── Order Cycle Time ───────────────────────────────
-        cycle_times = []
-        for po in delivered:
-            if po.expected_delivery and po.created_at:
-                expected_delivery = _ensure_utc(po.expected_delivery)
-                created_at = _ensure_utc(po.created_at)
-                delta = (expected_delivery - created_at).total_seconds() / 86400
-                cycle_times.append(delta)
-        order_cycle_time = float(np.mean(cycle_times)) if cycle_times else 7.0
+        order_cycle_time = cycle_days_sum / cycle_count if cycle_count else 7.0
 
         # ── Perfect Order Rate ─────────────────────────────
-        total_orders = len([po for po in purchase_orders if po.status != OrderStatus.CANCELLED])
-        perfect = len([
-            po for po in delivered
-            if po.quantity > 0  # simplified: delivered = "perfect"
-        ])
         perfect_order_rate = perfect / max(total_orders, 1)
 
         # ── Inventory Turnover ─────────────────────────────
-        annual_cogs = sum(p.daily_demand_avg * p.unit_cost * 365 for p in products)
+        annual_cogs = demand_cost * 365
         inventory_turnover = annual_cogs / max(total_value, 1)
 
         # ── Backorder Rate ─────────────────────────────────
         # Count products at zero stock with active demand as backordered
-        backordered = sum(
-            1 for p in products
-            if p.current_stock <= 0 and p.daily_demand_avg > 0
-        )
         backorder_rate = backordered / max(len(products), 1)
 
         # ── Supplier Defect Rate ───────────────────────────
-        active_suppliers = [s for s in suppliers if s.is_active]
+        active_defect_rates = [s.defect_rate for s in suppliers if s.is_active]
         supplier_defect_rate = (
-            float(np.mean([s.defect_rate for s in active_suppliers]))
-            if active_suppliers else 0.02
+            sum(active_defect_rates) / len(active_defect_rates)
+            if active_defect_rates else 0.02
         )
 
         snapshot = KPISnapshot(
@@ -164,11 +188,8 @@ class KPIEngine:
             supplier_defect_rate=round(supplier_defect_rate, 4),
         )
 
+        # Bounded deque: the oldest snapshot drops off once kpi_max_history is reached
         self._history.append(snapshot)
-        # Trim history to prevent unbounded memory growth
-        max_hist = settings.kpi_max_history
-        if len(self._history) > max_hist:
-            del self._history[:len(self._history) - max_hist]
         log.info(
             "kpi_snapshot",
             otif=snapshot.otif,
@@ -181,65 +202,78 @@ class KPIEngine:
     def check_thresholds(self, snapshot: KPISnapshot) -> List[SupplyChainEvent]:  # noqa: C901
         """Check if any KPI exceeds configured thresholds."""
         events: List[SupplyChainEvent] = []
-
-        if snapshot.otif < settings.otif_target:
+        otif_target = settings.otif_target
+        fill_rate_target = settings.fill_rate_target
+        mape_threshold = settings.mape_threshold
+        dsi_min = settings.dsi_min
+        dsi_max = settings.dsi_max
+        stockout_tolerance = settings.stockout_tolerance
+        # Filtered severities are skipped before their message is formatted
+        raised = _SEVERITY_ORDER[_SEVERITY_ORDER.index(settings.min_event_severity):]
+        high = AlertSeverity.HIGH in raised
+        medium = AlertSeverity.MEDIUM in raised
+
+        if high and snapshot.otif < otif_target:
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.HIGH,
                 source_agent="kpi_engine",
-                description=f"OTIF {snapshot.otif:.1%} below target {settings.otif_target:.1%}",
-                data={"metric": "otif", "value": snapshot.otif, "target": settings.otif_target},
+                description=f"OTIF {snapshot.otif:.1%} below target {otif_target:.1%}",
+                data={"metric": "otif", "value": snapshot.otif, "target": otif_target},
             ))
 
-        if snapshot.fill_rate < settings.fill_rate_target:
+        if high and snapshot.fill_rate < fill_rate_target:
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.HIGH,
                 source_agent="kpi_engine",
-                description=f"Fill rate {snapshot.fill_rate:.1%} below target {settings.fill_rate_target:.1%}",
-                data={"metric": "fill_rate", "value": snapshot.fill_rate, "target": settings.fill_rate_target},
+                description=f"Fill rate {snapshot.fill_rate:.1%} below target {fill_rate_target:.1%}",
+                data={"metric": "fill_rate", "value": snapshot.fill_rate, "target": fill_rate_target},
             ))
 
-        if snapshot.mape is not None and not math.isnan(snapshot.mape) and snapshot.mape > settings.mape_threshold:
+        if (
+            medium and snapshot.mape is not None
+            and not math.isnan(snapshot.mape) and snapshot.mape > mape_threshold
+        ):
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.MEDIUM,
                 source_agent="kpi_engine",
-                description=f"MAPE {snapshot.mape:.1f}% exceeds threshold {settings.mape_threshold:.1f}%",
-                data={"metric": "mape", "value": snapshot.mape, "target": settings.mape_threshold},
+                description=f"MAPE {snapshot.mape:.1f}% exceeds threshold {mape_threshold:.1f}%",
+                data={"metric": "mape", "value": snapshot.mape, "target": mape_threshold},
             ))
 
-        if snapshot.dsi > settings.dsi_max:
+        if medium and snapshot.dsi > dsi_max:
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.MEDIUM,
                 source_agent="kpi_engine",
-                description=f"DSI {snapshot.dsi:.1f} exceeds max {settings.dsi_max:.1f}",
-                data={"metric": "dsi", "value": snapshot.dsi, "target": settings.dsi_max},
+                description=f"DSI {snapshot.dsi:.1f} exceeds max {dsi_max:.1f}",
+                data={"metric": "dsi", "value": snapshot.dsi, "target": dsi_max},
             ))
 
-        if snapshot.dsi < settings.dsi_min:
+        if high and snapshot.dsi < dsi_min:
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.HIGH,
                 source_agent="kpi_engine",
-                description=f"DSI {snapshot.dsi:.1f} below min {settings.dsi_min:.1f}",
-                data={"metric": "dsi", "value": snapshot.dsi, "target": settings.dsi_min},
+                description=f"DSI {snapshot.dsi:.1f} below min {dsi_min:.1f}",
+                data={"metric": "dsi", "value": snapshot.dsi, "target": dsi_min},
             ))
 
-        if snapshot.stockout_count > settings.stockout_tolerance:
+        if snapshot.stockout_count > stockout_tolerance:
             events.append(SupplyChainEvent(
                 event_type="kpi_threshold_violated",
                 severity=AlertSeverity.CRITICAL,
                 source_agent="kpi_engine",
                 description=(
                     f"Stockout count {snapshot.stockout_count} "
-                    f"exceeds tolerance {settings.stockout_tolerance}"
+                    f"exceeds tolerance {stockout_tolerance}"
                 ),
                 data={
                     "metric": "stockout_count",
                     "value": snapshot.stockout_count,
-                    "target": settings.stockout_tolerance,
+                    "target": stockout_tolerance,
                 },
             ))
 
@@ -247,7 +281,7 @@ class KPIEngine:
 
     def get_trend(self, metric: str, periods: int = 30) -> Dict[str, Any]:  # noqa: C901
         """Get trend data for a specific KPI metric."""
-        recent = self._history[-periods:]
+        recent = self.recent(periods)
         if not recent:
             return {"metric": metric, "values": [], "trend": "no_data"}
 
@@ -267,7 +301,7 @@ class KPIEngine:
             ]
             if len(clean) >= 3:
                 indices, clean_vals = zip(*clean, strict=False)
-                slope = np.polyfit(indices, clean_vals, 1)[0]
+                slope = _linear_slope(indices, clean_vals)
             else:
                 slope = 0.0
             if metric in lower_is_better:
@@ -285,10 +319,16 @@ class KPIEngine:
             "values": values,
             "timestamps": timestamps,
             "current": values[-1] if values else 0,
-            "average": round(float(np.mean(numeric_values)), 4) if numeric_values else 0,
+            "average": round(sum(numeric_values) / len(numeric_values), 4) if numeric_values else 0,
             "trend": trend,
         }
 
+    def recent(self, periods: int) -> List[KPISnapshot]:
+        """Return the last ``periods`` snapshots, oldest first."""
+        tail = list(islice(reversed(self._history), max(periods, 0)))
+        tail.reverse()
+        return tail
+
     @property
-    def history(self) -> List[KPISnapshot]:
+    def history(self) -> deque[KPISnapshot]:
         return self._history
@@ -0,0 +1,161 @@
+"""Inner loops of the inventory optimizers.
+
+Written so Numba can compile them when it is installed; without it the same
+functions run as plain Python. Randomness comes from the caller, either as a
+NumPy ``Generator`` (which Numba advances exactly like NumPy does) or as
+pre-drawn arrays, so a seeded run gives the same answer with or without the
+optional dependency.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _ga_evolve_loop(
+    pop, generations, avg_demand, std_demand, lead_time, unit_cost, selling_price,
+    min_order_qty, holding_cost_pct, stockout_z, stockout_penalty, ordering_freq_cost,
+    mutation_rate, rng,
+):
+    """Evolve ``pop`` (rows of [reorder_point, safety_stock, order_qty]).
+
+    Returns the best individual seen across all generations and its fitness.
+    """
+    pop_size = pop.shape[0]
+    gene_index = np.arange(3).reshape(1, 3)
+    best = pop[0].copy()
+    best_fitness = -1.0
+
+    # Cost coefficients that do not change between generations
+    holding_per_unit = unit_cost * holding_cost_pct / 365  # daily
+    stockout_scale = std_demand * math.sqrt(lead_time) * stockout_z + 0.01
+    stockout_cost_max = avg_demand * selling_price * 30 * stockout_penalty
+    monthly_demand = avg_demand * 30
+    cost_per_order = unit_cost * ordering_freq_cost
+
+    for _gen in range(generations):
+        # Fitness = minimize total cost (holding + stockout penalty + ordering)
+        safety_stock = pop[:, 1]
+        order_qty = pop[:, 2]
+        holding = (safety_stock + order_qty / 2) * holding_per_unit
+        stockout_prob = np.maximum(0.0, 1 - safety_stock / stockout_scale)
+        ordering_freq = np.maximum(monthly_demand / np.maximum(order_qty, 1.0), 0.1)
+        cost = holding + stockout_prob * stockout_cost_max + ordering_freq * cost_per_order
+        fitness = 1 / (cost + 1)
+
+        # Track best individual before population is replaced
+        gen_best = np.argmax(fitness)
+        if fitness[gen_best] > best_fitness:
+            best_fitness = fitness[gen_best]
+            best[:] = pop[gen_best]
+
+        # Roulette-wheel selection: draw both parents of every child at once
+        # and binary-search them in the cumulative fitness
+        cdf = np.cumsum(fitness)
+        parents = np.searchsorted(cdf, rng.random(2 * pop_size) * cdf[-1], side="right")
+        parents = np.minimum(parents, pop_size - 1)  # r * total can round up to total
+        first = pop[parents[0::2]]
+        second = pop[parents[1::2]]
+
+        # Single-point crossover: genes before the cut come from the first parent
+        cut = rng.integers(1, 3, pop_size).reshape(pop_size, 1)
+        children = np.where(gene_index < cut, first, second)
+        # Per-gene Gaussian mutation
+        mutate = rng.random((pop_size, 3)) < mutation_rate
+        noise = rng.normal(0.0, std_demand * 0.2, (pop_size, 3))
+        children = np.maximum(np.where(mutate, children + noise, children), 1.0)
+        children[:, 2] = np.maximum(children[:, 2], min_order_qty)
+
+        # Elitism: preserve best individual from previous generation
+        children[0] = best
+        pop = children
+
+    return best, best_fitness
+
+
+def _dqn_train_loop(
+    q, visited, current_stock, safety_stock, reorder_point, selling_price, unit_cost,
+    order_qtys, explore, random_actions, demands, lr, gamma,
+):
+    """Tabular Q-learning over pre-drawn episodes, updating ``q`` and ``visited`` in place.
+
+    ``q`` is indexed [stock level][action]; ``explore``, ``random_actions`` and
+    ``demands`` hold one row per episode and one column per simulated day.
+    Works on ndarrays (compiled) and on nested lists (pure Python).
+    """
+    n_actions = len(order_qtys)
+    for ep in range(len(demands)):
+        ep_explore = explore[ep]
+        ep_actions = random_actions[ep]
+        ep_demands = demands[ep]
+        stock = current_stock
+        state = (0 if stock < safety_stock else 1 if stock < reorder_point
+                 else 2 if stock < reorder_point * 2 else 3)
+
+        for day in range(len(ep_demands)):
+            q_row = q[state]
+
+            # Epsilon-greedy action (first best action on ties)
+            if ep_explore[day]:
+                action = ep_actions[day]
+            else:
+                action = 0
+                for a in range(1, n_actions):
+                    if q_row[a] > q_row[action]:
+                        action = a
+
+            # Simulate
+            order_qty = order_qtys[action]
+            stock = stock + order_qty - ep_demands[day]
+
+            # Reward: penalize stockouts and excess holding
+            reward = 0.0
+            if stock < 0:
+                reward -= abs(stock) * selling_price * 0.5  # stockout penalty
+                stock = 0.0
+            else:
+                reward -= stock * unit_cost * 0.001  # holding cost
+            if order_qty > 0:
+                reward -= order_qty * unit_cost * 0.01  # ordering cost
+
+            # Update Q-table (Bellman equation), bootstrapping from the next state
+            next_state = (0 if stock < safety_stock else 1 if stock < reorder_point
+                          else 2 if stock < reorder_point * 2 else 3)
+            next_row = q[next_state]
+            max_next_q = next_row[0]
+            for a in range(1, n_actions):
+                if next_row[a] > max_next_q:
+                    max_next_q = next_row[a]
+            q_row[action] += lr * (reward + gamma * max_next_q - q_row[action])
+            visited[state] = True
+            state = next_state
+
+
+if HAS_NUMBA:
+    ga_evolve = njit(cache=True)(_ga_evolve_loop)
+    dqn_train = njit(cache=True)(_dqn_train_loop)
+else:
+    ga_evolve = _ga_evolve_loop
+
+    def dqn_train(
+        q, visited, current_stock, safety_stock, reorder_point, selling_price, unit_cost,
+        order_qtys, explore, random_actions, demands, lr, gamma,
+    ):
+        """Run ``_dqn_train_loop`` on nested lists, which index faster than ndarrays."""
+        q_rows = q.tolist()
+        seen = visited.tolist()
+        _dqn_train_loop(
+            q_rows, seen, current_stock, safety_stock, reorder_point, selling_price, unit_cost,
+            order_qtys.tolist(), explore.tolist(), random_actions.tolist(), demands.tolist(), lr, gamma,
+        )
+        q[:] = q_rows
+        visited[:] = seen
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
@@ -13,6 +14,11 @@ from ..utils.logging_config import get_logger
 
 log = get_logger(__name__)
 
+# Severity tiers: a value strictly above the i-th bin promotes to level i+1
+_SEVERITY_LEVELS = (AlertSeverity.MEDIUM, AlertSeverity.HIGH, AlertSeverity.CRITICAL)
+_Z_SCORE_BINS = (3.0, 4.0)
+_COMBINED_SCORE_BINS = (0.6, 0.8)
+
 
 class AnomalyDetector:
     """Detects demand anomalies, cost anomalies, and lead-time anomalies.
@@ -37,33 +43,28 @@ class AnomalyDetector:
 
     def train(self, data: pd.DataFrame) -> None:
         """Train anomaly detection models per product."""
-        product_ids = data["product_id"].unique()
-
-        for pid in product_ids:
-            series = data[data["product_id"] == pid]["quantity"].values
-            if len(series) < 10:
-                continue
-
-            self._stats[pid] = {
-                "mean": float(np.mean(series)),
-                "std": float(np.std(series, ddof=1)),
-                "median": float(np.median(series)),
-                "q1": float(np.percentile(series, 25)),
-                "q3": float(np.percentile(series, 75)),
-                "iqr": float(np.percentile(series, 75) - np.percentile(series, 25)),
-                "max": float(np.max(series)),
-                "min": float(np.min(series)),
-            }
-
-            if self._use_sklearn:
-                from sklearn.ensemble import IsolationForest
-
+        grouped = data.groupby("product_id", sort=False, observed=True)["quantity"]
+        stats_df = grouped.agg(["mean", "std", "median", "max", "min", "count"])
+        quartiles = grouped.quantile([0.25, 0.75]).unstack()
+        stats_df["q1"] = quartiles[0.25]
+        stats_df["q3"] = quartiles[0.75]
+        stats_df["iqr"] = stats_df["q3"] - stats_df["q1"]
+        stats_df = stats_df[stats_df["count"] >= 10]
+        stats_df = stats_df[["mean", "std", "median", "q1", "q3", "iqr", "max", "min"]].astype(float)
+        self._stats.update(stats_df.to_dict(orient="index"))
+
+        if self._use_sklearn:
+            from sklearn.ensemble import IsolationForest
+
+            for pid, series in grouped:
+                if pid not in stats_df.index:
+                    continue
                 model = IsolationForest(
                     contamination=self._contamination,
                     random_state=42,
                     n_estimators=100,
                 )
-                model.fit(series.reshape(-1, 1))
+                model.fit(series.to_numpy().reshape(-1, 1))
                 self._models[pid] = model
 
         self._trained = True
@@ -123,87 +124,127 @@ class AnomalyDetector:
             demand = product_demand_map.get(
                 pid, current_data.get("daily_demand_avg", stats["mean"])
             )
-
-            # Demand spike detection — combine Z-score and IsolationForest
             z_score = abs(demand - stats["mean"]) / max(stats["std"], 0.01 * abs(stats["mean"]), 0.01)
-            z_anomaly = z_score > 2.5
-
-            # IsolationForest prediction (if trained for this product)
-            if_anomaly = False
-            if_score = 0.0
-            if pid in self._models:
-                if_model = self._models[pid]
-                if_pred = if_model.predict(np.array([[demand]]))[0]  # -1 = anomaly
-                if_raw = if_model.decision_function(np.array([[demand]]))[0]
-                if_anomaly = if_pred == -1
-                if_score = max(0.0, -if_raw)  # higher = more anomalous
-
-            # Flag anomaly if either detector triggers
-            if z_anomaly or if_anomaly:
-                # Boost confidence when both detectors agree
-                base_score = min(z_score / 5, 1.0)
-                if z_anomaly and if_anomaly:
-                    combined_score = min(1.0, base_score * 0.6 + if_score * 0.4 + 0.1)
-                elif if_anomaly:
-                    combined_score = min(1.0, max(0.3, if_score * 0.8))
-                else:
-                    combined_score = base_score
-
-                severity = (
-                    AlertSeverity.CRITICAL if z_score > 4 or combined_score > 0.8
-                    else AlertSeverity.HIGH if z_score > 3 or combined_score > 0.6
-                    else AlertSeverity.MEDIUM
-                )
-                detection_methods = []
-                if z_anomaly:
-                    detection_methods.append(f"z-score={z_score:.2f}")
-                if if_anomaly:
-                    detection_methods.append(f"IF-score={if_score:.2f}")
-
-                anomalies.append(AnomalyRecord(
-                    anomaly_type="demand_spike",
-                    product_id=pid,
-                    severity=severity,
-                    score=round(combined_score, 3),
-                    description=(
-                        f"Demand anomaly ({', '.join(detection_methods)}): "
-                        f"current={demand:.1f}, mean={stats['mean']:.1f}"
-                    ),
-                ))
+            record = self._demand_anomaly(pid, demand, z_score, stats)
+            if record is not None:
+                anomalies.append(record)
 
             # Stock level anomaly — use per-product stock when available
             current_stock = product_stock_map.get(
                 pid, current_data.get("current_stock", 0)
             )
             if current_stock > 0 and stats["mean"] > 0:
-                dsi = current_stock / stats["mean"]
-                if dsi > settings.dsi_max:
-                    anomalies.append(AnomalyRecord(
-                        anomaly_type="overstock",
-                        product_id=pid,
-                        severity=AlertSeverity.MEDIUM,
-                        score=round(min(dsi / 100, 1.0), 3),
-                        description=f"Overstock: DSI={dsi:.1f} days (max={settings.dsi_max})",
-                    ))
-                elif dsi < settings.dsi_min:
-                    anomalies.append(AnomalyRecord(
-                        anomaly_type="understock",
-                        product_id=pid,
-                        severity=AlertSeverity.HIGH,
-                        score=round(1 - dsi / settings.dsi_min, 3),
-                        description=f"Understock: DSI={dsi:.1f} days (min={settings.dsi_min})",
-                    ))
+                record = self._stock_anomaly(pid, current_stock / stats["mean"])
+                if record is not None:
+                    anomalies.append(record)
 
         return anomalies
 
+    def _demand_anomaly(
+        self, pid: str, demand: float, z_score: float, stats: dict
+    ) -> Optional[AnomalyRecord]:
+        """Combine the Z-score and IsolationForest verdicts for one product."""
+        z_anomaly = z_score > 2.5
+
+        # IsolationForest prediction (if trained for this product)
+        if_anomaly = False
+        if_score = 0.0
+        if_model = self._models.get(pid)
+        if if_model is not None:
+            # predict() is just decision_function() < 0, so score once
+            if_raw = if_model.decision_function(np.array([[demand]]))[0]
+            if_anomaly = if_raw < 0
+            if_score = max(0.0, -if_raw)  # higher = more anomalous
+
+        # Flag anomaly if either detector triggers
+        if not (z_anomaly or if_anomaly):
+            return None
+
+        # Boost confidence when both detectors agree
+        base_score = min(z_score / 5, 1.0)
+        if z_anomaly and if_anomaly:
+            combined_score = min(1.0, base_score * 0.6 + if_score * 0.4 + 0.1)
+        elif if_anomaly:
+            combined_score = min(1.0, max(0.3, if_score * 0.8))
+        else:
+            combined_score = base_score
+
+        severity = _SEVERITY_LEVELS[max(
+            bisect_left(_Z_SCORE_BINS, z_score),
+            bisect_left(_COMBINED_SCORE_BINS, combined_score),
+        )]
+        detection_methods = []
+        if z_anomaly:
+            detection_methods.append(f"z-score={z_score:.2f}")
+        if if_anomaly:
+            detection_methods.append(f"IF-score={if_score:.2f}")
+
+        return AnomalyRecord(
+            anomaly_type="demand_spike",
+            product_id=pid,
+            severity=severity,
+            score=round(combined_score, 3),
+            description=(
+                f"Demand anomaly ({', '.join(detection_methods)}): "
+                f"current={demand:.1f}, mean={stats['mean']:.1f}"
+            ),
+        )
+
+    @staticmethod
+    def _stock_anomaly(pid: str, dsi: float) -> Optional[AnomalyRecord]:
+        """Flag over/understock from days of supply against the trained mean."""
+        if dsi > settings.dsi_max:
+            return AnomalyRecord(
+                anomaly_type="overstock",
+                product_id=pid,
+                severity=AlertSeverity.MEDIUM,
+                score=round(min(dsi / 100, 1.0), 3),
+                description=f"Overstock: DSI={dsi:.1f} days (max={settings.dsi_max})",
+            )
+        if dsi < settings.dsi_min:
+            return AnomalyRecord(
+                anomaly_type="understock",
+                product_id=pid,
+                severity=AlertSeverity.HIGH,
+                score=round(1 - dsi / settings.dsi_min, 3),
+                description=f"Understock: DSI={dsi:.1f} days (min={settings.dsi_min})",
+            )
+        return None
+
     def detect_batch(self, products: list) -> List[AnomalyRecord]:
-        """Run detection across all products."""
+        """Run detection across all products.
+
+        Z-scores and days of supply are computed for the whole batch in one
+        NumPy pass; only products that can produce a record (a Z-score or
+        DSI breach, or an IsolationForest model to consult) are visited in
+        Python.
+        """
         all_anomalies: List[AnomalyRecord] = []
-        for product in products:
-            data = {
-                "product_id": product.product_id,
-                "daily_demand_avg": product.daily_demand_avg,
-                "current_stock": product.current_stock,
-            }
-            all_anomalies.extend(self.detect(data))
+        if not self._trained:
+            return all_anomalies
+
+        tracked = [p for p in products if p.product_id in self._stats]
+        if not tracked:
+            return all_anomalies
+        stats = [self._stats[p.product_id] for p in tracked]
+        n = len(tracked)
+
+        mean = np.fromiter((s["mean"] for s in stats), dtype=float, count=n)
+        std = np.fromiter((s["std"] for s in stats), dtype=float, count=n)
+        demand = np.fromiter((p.daily_demand_avg for p in tracked), dtype=float, count=n)
+        stock = np.fromiter((p.current_stock for p in tracked), dtype=float, count=n)
+
+        z_scores = np.abs(demand - mean) / np.maximum(np.maximum(std, 0.01 * np.abs(mean)), 0.01)
+        has_dsi = (stock > 0) & (mean > 0)
+        dsi = np.divide(stock, mean, out=np.zeros(n), where=has_dsi)
+        stock_flag = has_dsi & ((dsi > settings.dsi_max) | (dsi < settings.dsi_min))
+        has_model = np.fromiter((p.product_id in self._models for p in tracked), dtype=bool, count=n)
+
+        for i in np.flatnonzero((z_scores > 2.5) | has_model | stock_flag):
+            pid = tracked[i].product_id
+            record = self._demand_anomaly(pid, float(demand[i]), float(z_scores[i]), stats[i])
+            if record is not None:
+                all_anomalies.append(record)
+            if stock_flag[i]:
+                all_anomalies.append(self._stock_anomaly(pid, float(dsi[i])))
         return all_anomalies
@@ -14,6 +14,7 @@ import pandas as pd
 
 from ..data.schemas import ForecastResult, utc_now
 from ..utils.logging_config import get_logger
+from .forecaster import _trend_slope
 
 log = get_logger(__name__)
 
@@ -103,11 +104,12 @@ class ChronosForecaster:
         lower = np.percentile(samples, 10, axis=0)
         upper = np.percentile(samples, 90, axis=0)
 
+        now = utc_now()
         results = []
         for i in range(horizon):
             results.append(ForecastResult(
                 product_id=product_id,
-                forecast_date=utc_now() + timedelta(days=i + 1),
+                forecast_date=now + timedelta(days=i + 1),
                 predicted_demand=round(float(max(0, median[i])), 1),
                 confidence_lower=round(float(max(0, lower[i])), 1),
                 confidence_upper=round(float(upper[i]), 1),
@@ -121,17 +123,18 @@ class ChronosForecaster:
         """Statistical fallback when Chronos is not installed."""
         mean = float(np.mean(series))
         std = float(np.std(series))
-        trend = float(np.polyfit(range(len(series)), series, 1)[0]) if len(series) > 2 else 0.0
+        trend = _trend_slope(series) if len(series) > 2 else 0.0
 
         results = []
         product_seed = hash(product_id) % (2**31)
         rng = np.random.RandomState(product_seed)
+        now = utc_now()
         for i in range(horizon):
             predicted = mean + trend * i + rng.normal(0, std * 0.2)
             predicted = max(0, predicted)
             results.append(ForecastResult(
                 product_id=product_id,
-                forecast_date=utc_now() + timedelta(days=i + 1),
+                forecast_date=now + timedelta(days=i + 1),
                 predicted_demand=round(predicted, 1),
                 confidence_lower=round(max(0, predicted - 1.65 * std), 1),
                 confidence_upper=round(predicted + 1.65 * std, 1),
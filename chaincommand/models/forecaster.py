@@ -3,20 +3,37 @@
 from __future__ import annotations
 
 import hashlib
-import random
 from datetime import timedelta
 from typing import Dict, List, Optional, Protocol, runtime_checkable
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 from ..config import settings
+from ..data.generator import make_rng
 from ..data.schemas import ForecastResult, utc_now
 from ..utils.logging_config import get_logger
 
 log = get_logger(__name__)
 
 
+def _product_rng(product_id: str) -> np.random.Generator:
+    """Generator seeded from the product ID so repeated forecasts agree."""
+    digest = hashlib.md5(product_id.encode(), usedforsecurity=False).hexdigest()  # noqa: S324
+    return make_rng(int(digest, 16) % (2**32))
+
+
+def _trend_slope(y: np.ndarray) -> float:
+    """Least-squares slope of a daily series (closed form; same result as polyfit degree 1)."""
+    n = len(y)
+    if n < 2:
+        return 0.0
+    y = np.asarray(y, dtype=np.float64)
+    dx = np.arange(n, dtype=np.float64) - (n - 1) * 0.5
+    return float(dx @ (y - y.mean())) / (n * (n * n - 1) / 12.0)
+
+
 class LSTMForecaster:
     """LSTM-based demand forecaster.
 
@@ -28,9 +45,15 @@ class LSTMForecaster:
         self._seq_length = settings.lstm_seq_length
         self._trained: Dict[str, dict] = {}  # product_id -> model state
         self._accuracy_cache: Dict[str, dict] = {}
+        # (product_id, horizon) -> (state, forecast bands); valid while state is current
+        self._band_cache: Dict[tuple, tuple] = {}
 
     def train(self, history: pd.DataFrame, product_id: str) -> None:
-        series = history[history["product_id"] == product_id]["quantity"].values
+        self._fit(history[history["product_id"] == product_id], product_id)
+
+    def _fit(self, rows: pd.DataFrame, product_id: str) -> None:
+        """Train on ``rows`` already restricted to ``product_id``."""
+        series = rows["quantity"].values
         if len(series) < self._seq_length:
             log.warning("lstm_train_skip", product_id=product_id, reason="insufficient data")
             return
@@ -39,7 +62,7 @@ class LSTMForecaster:
         self._trained[product_id] = {
             "mean": float(np.mean(series)),
             "std": float(np.std(series, ddof=1)),
-            "trend": float(np.polyfit(range(len(series)), series, 1)[0]),
+            "trend": _trend_slope(series),
             "last_values": series[-self._seq_length:].tolist(),
             "trained_at": utc_now(),
         }
@@ -50,24 +73,43 @@ class LSTMForecaster:
         if state is None:
             return []
 
-        results = []
-        base = state["mean"]
-        trend = state["trend"]
-        std = state["std"]
-
-        rng = random.Random(int(hashlib.md5(product_id.encode(), usedforsecurity=False).hexdigest(), 16) % (2**32))  # noqa: S324
-        for i in range(horizon):
-            predicted = base + trend * i + rng.gauss(0, std * 0.3)
-            predicted = max(0, predicted)
-            results.append(ForecastResult(
+        predicted, lower, upper = self._bands(state, product_id, horizon)
+        now = utc_now()
+        # Fields are built from float lists we produced ourselves; skip re-validation
+        return [
+            ForecastResult.model_construct(
                 product_id=product_id,
-                forecast_date=utc_now() + timedelta(days=i + 1),
-                predicted_demand=round(predicted, 1),
-                confidence_lower=round(max(0, predicted - 1.65 * std), 1),
-                confidence_upper=round(predicted + 1.65 * std, 1),
+                forecast_date=now + timedelta(days=i + 1),
+                predicted_demand=demand,
+                confidence_lower=lo,
+                confidence_upper=hi,
                 model_used="lstm",
-            ))
-        return results
+            )
+            for i, (demand, lo, hi) in enumerate(zip(predicted, lower, upper, strict=True))
+        ]
+
+    def _bands(self, state: dict, product_id: str, horizon: int) -> tuple:
+        """Rounded (predicted, lower, upper) lists, memoized until the product is retrained."""
+        key = (product_id, horizon)
+        cached = self._band_cache.get(key)
+        if cached is not None and cached[0] is state:
+            return cached[1]
+
+        std = state["std"]
+        predicted = self._demand_path(state, product_id, horizon)
+        bands = (
+            predicted.round(1).tolist(),
+            np.maximum(0.0, predicted - 1.65 * std).round(1).tolist(),
+            (predicted + 1.65 * std).round(1).tolist(),
+        )
+        self._band_cache[key] = (state, bands)
+        return bands
+
+    @staticmethod
+    def _demand_path(state: dict, product_id: str, horizon: int) -> np.ndarray:
+        """Point forecasts for days 1..horizon (trend plus seeded noise, floored at 0)."""
+        noise = _product_rng(product_id).normal(0.0, state["std"] * 0.3, horizon)
+        return np.maximum(0.0, state["mean"] + state["trend"] * np.arange(horizon) + noise)
 
     def get_accuracy(self, product_id: str) -> dict:
         return self._accuracy_cache.get(product_id, {"mape": 0, "weights": {"lstm": 1.0}})
@@ -87,32 +129,39 @@ class XGBForecaster:
     def __init__(self) -> None:
         self._trained: Dict[str, dict] = {}
         self._accuracy_cache: Dict[str, dict] = {}
+        # (product_id, horizon, first_dow) -> (state, forecast bands)
+        self._band_cache: Dict[tuple, tuple] = {}
 
     def train(self, history: pd.DataFrame, product_id: str) -> None:
-        series = history[history["product_id"] == product_id]
+        self._fit(history[history["product_id"] == product_id], product_id)
+
+    def _fit(self, series: pd.DataFrame, product_id: str) -> None:
+        """Train on ``series`` already restricted to ``product_id``."""
         if len(series) < 14:
             return
 
         quantities = series["quantity"].values
         # Feature engineering: day_of_week, month, rolling averages
         has_dow = "day_of_week" in series.columns
+        mean = float(np.mean(quantities))
         if has_dow:
-            weekly_pattern = [
-                float(series[series["day_of_week"] == d]["quantity"].mean())
-                if len(series[series["day_of_week"] == d]) > 0
-                else float(np.mean(quantities))
-                for d in range(7)
-            ]
+            # Weekdays with no observations fall back to the overall mean
+            weekly_pattern = (
+                series.groupby("day_of_week")["quantity"].mean()
+                .reindex(range(7))
+                .fillna(mean)
+                .to_numpy(dtype=np.float64)
+            )
         else:
             log.warning("xgb_no_day_of_week", product_id=product_id,
                         msg="day_of_week column missing; using mean for weekly pattern")
-            weekly_pattern = [float(np.mean(quantities))] * 7
+            weekly_pattern = np.full(7, mean)
 
         self._trained[product_id] = {
-            "mean": float(np.mean(quantities)),
+            "mean": mean,
             "std": float(np.std(quantities, ddof=1)),
             "median": float(np.median(quantities)),
-            "trend": float(np.polyfit(range(len(quantities)), quantities, 1)[0]),
+            "trend": _trend_slope(quantities),
             "weekly_pattern": weekly_pattern,
             "trained_at": utc_now(),
         }
@@ -123,26 +172,49 @@ class XGBForecaster:
         if state is None:
             return []
 
-        results = []
-        rng = random.Random(int(hashlib.md5(product_id.encode(), usedforsecurity=False).hexdigest(), 16) % (2**32))  # noqa: S324
-        for i in range(horizon):
-            future_date = utc_now() + timedelta(days=i + 1)
-            dow = future_date.weekday()
-
-            # Use weekly pattern + trend
-            base = state["weekly_pattern"][dow] if dow < len(state["weekly_pattern"]) else state["mean"]
-            predicted = base + state["trend"] * i + rng.gauss(0, state["std"] * 0.2)
-            predicted = max(0, predicted)
+        now = utc_now()
+        first_dow = (now.weekday() + 1) % 7  # forecasts start tomorrow
+        predicted, lower, upper = self._bands(state, product_id, horizon, first_dow)
 
-            results.append(ForecastResult(
+        return [
+            ForecastResult.model_construct(
                 product_id=product_id,
-                forecast_date=future_date,
-                predicted_demand=round(predicted, 1),
-                confidence_lower=round(max(0, predicted - 1.96 * state["std"]), 1),
-                confidence_upper=round(predicted + 1.96 * state["std"], 1),
+                forecast_date=now + timedelta(days=i + 1),
+                predicted_demand=demand,
+                confidence_lower=lo,
+                confidence_upper=hi,
                 model_used="xgboost",
-            ))
-        return results
+            )
+            for i, (demand, lo, hi) in enumerate(zip(predicted, lower, upper, strict=True))
+        ]
+
+    def _bands(self, state: dict, product_id: str, horizon: int, first_dow: int) -> tuple:
+        """Rounded (predicted, lower, upper) lists, memoized until the product is retrained."""
+        key = (product_id, horizon, first_dow)
+        cached = self._band_cache.get(key)
+        if cached is not None and cached[0] is state:
+            return cached[1]
+
+        std = state["std"]
+        predicted = self._demand_path(state, product_id, horizon, first_dow)
+        bands = (
+            predicted.round(1).tolist(),
+            np.maximum(0.0, predicted - 1.96 * std).round(1).tolist(),
+            (predicted + 1.96 * std).round(1).tolist(),
+        )
+        self._band_cache[key] = (state, bands)
+        return bands
+
+    @staticmethod
+    def _demand_path(state: dict, product_id: str, horizon: int, first_dow: int) -> np.ndarray:
+        """Point forecasts: weekday pattern plus trend and seeded noise, floored at 0.
+
+        ``first_dow`` is the weekday (Mon=0) of the first forecast day.
+        """
+        steps = np.arange(horizon)
+        base = state["weekly_pattern"][(first_dow + steps) % 7]
+        noise = _product_rng(product_id).normal(0.0, state["std"] * 0.2, horizon)
+        return np.maximum(0.0, base + state["trend"] * steps + noise)
 
     def get_accuracy(self, product_id: str) -> dict:
         return self._accuracy_cache.get(product_id, {"mape": 0, "weights": {"xgb": 1.0}})
@@ -169,20 +241,21 @@ class EnsembleForecaster:
         return self._lstm.is_trained or self._xgb.is_trained
 
     def train(self, history: pd.DataFrame, product_id: str) -> None:
+        self._fit(history[history["product_id"] == product_id], product_id)
+
+    def _fit(self, rows: pd.DataFrame, product_id: str) -> None:
+        """Calibrate and train on ``rows`` already restricted to ``product_id``."""
         # Initial equal weights
         self._weights[product_id] = {"lstm": 0.5, "xgb": 0.5}
 
         # Calibrate weights using a proper train/holdout split to avoid data leakage
-        series = history[history["product_id"] == product_id]["quantity"].values
+        series = rows["quantity"].values
         if len(series) > 60:
             # Step 1: Train on history[:-30] only for weight calibration
             holdout_size = 30
-            cal_history = history[history["product_id"] == product_id].iloc[:-holdout_size]
-            cal_df = history[history["product_id"] != product_id].copy()
-            cal_df = pd.concat([cal_df, cal_history], ignore_index=True)
-
-            self._lstm.train(cal_df, product_id)
-            self._xgb.train(cal_df, product_id)
+            cal_rows = rows.iloc[:-holdout_size]
+            self._lstm._fit(cal_rows, product_id)
+            self._xgb._fit(cal_rows, product_id)
 
             # Step 2: Generate holdout predictions from trained stats directly
             # (avoids temporal misalignment from predict() using utc_now())
@@ -191,24 +264,8 @@ class EnsembleForecaster:
             xgb_state = self._xgb._trained.get(product_id)
 
             if lstm_state and xgb_state:
-                pid_hash = hashlib.md5(product_id.encode(), usedforsecurity=False).hexdigest()  # noqa: S324
-                rng_l = random.Random(int(pid_hash, 16) % (2**32))
-                lstm_holdout = [
-                    max(0, lstm_state["mean"] + lstm_state["trend"] * i + rng_l.gauss(0, lstm_state["std"] * 0.3))
-                    for i in range(holdout_size)
-                ]
-                pid_hash_x = hashlib.md5(product_id.encode(), usedforsecurity=False).hexdigest()  # noqa: S324
-                rng_x = random.Random(int(pid_hash_x, 16) % (2**32))
-                xgb_weekly = xgb_state.get("weekly_pattern", [])
-                xgb_holdout = [
-                    max(
-                        0,
-                        xgb_state["mean"] + xgb_state["trend"] * i
-                        + (xgb_weekly[i % 7] - xgb_state["mean"] if xgb_weekly else 0)
-                        + rng_x.gauss(0, xgb_state["std"] * 0.2),
-                    )
-                    for i in range(holdout_size)
-                ]
+                lstm_holdout = LSTMForecaster._demand_path(lstm_state, product_id, holdout_size)
+                xgb_holdout = XGBForecaster._demand_path(xgb_state, product_id, holdout_size, first_dow=0)
 
                 lstm_mape = self._compute_mape(actual, lstm_holdout)
                 xgb_mape = self._compute_mape(actual, xgb_holdout)
@@ -228,8 +285,8 @@ class EnsembleForecaster:
                     }
 
         # Step 3: Retrain on full history with calibrated weights
-        self._lstm.train(history, product_id)
-        self._xgb.train(history, product_id)
+        self._lstm._fit(rows, product_id)
+        self._xgb._fit(rows, product_id)
 
         log.info(
             "ensemble_trained",
@@ -238,44 +295,65 @@ class EnsembleForecaster:
         )
 
     def train_all(self, history: pd.DataFrame, product_ids: List[str]) -> None:
-        for pid in product_ids:
-            self.train(history, pid)
+        """Train every product; fans out over ``settings.forecast_n_jobs`` workers.
+
+        History is split by product once (instead of a full-frame mask per
+        product and sub-model), each worker only receives its own rows, and
+        the per-product states are merged back afterwards.
+        """
+        wanted = set(product_ids)
+        groups = {
+            pid: rows
+            for pid, rows in history.groupby("product_id", sort=False, observed=True)
+            if pid in wanted
+        }
+        no_rows = history.iloc[:0]
+        results = Parallel(n_jobs=settings.forecast_n_jobs)(
+            delayed(_train_product)(groups.get(pid, no_rows), pid) for pid in product_ids
+        )
+        for pid, (lstm_state, xgb_state, weights, accuracy) in zip(product_ids, results, strict=True):
+            if lstm_state is not None:
+                self._lstm._trained[pid] = lstm_state
+            if xgb_state is not None:
+                self._xgb._trained[pid] = xgb_state
+            self._weights[pid] = weights
+            if accuracy is not None:
+                self._accuracy_cache[pid] = accuracy
 
     def predict(self, product_id: str, horizon: int = 30) -> List[ForecastResult]:
-        lstm_preds = self._lstm.predict(product_id, horizon)
-        xgb_preds = self._xgb.predict(product_id, horizon)
+        lstm_state = self._lstm._trained.get(product_id)
+        xgb_state = self._xgb._trained.get(product_id)
+        if lstm_state is None:
+            return self._xgb.predict(product_id, horizon)
+        if xgb_state is None:
+            return self._lstm.predict(product_id, horizon)
+
         weights = self._weights.get(product_id, {"lstm": 0.5, "xgb": 0.5})
+        w_l, w_x = weights["lstm"], weights["xgb"]
+        now = utc_now()
+        first_dow = (now.weekday() + 1) % 7
 
-        if not lstm_preds and not xgb_preds:
-            return []
-        if not lstm_preds:
-            return xgb_preds
-        if not xgb_preds:
-            return lstm_preds
-
-        results = []
-        for lstm_r, xgb_r in zip(lstm_preds, xgb_preds, strict=False):
-            w_l, w_x = weights["lstm"], weights["xgb"]
-            demand = w_l * lstm_r.predicted_demand + w_x * xgb_r.predicted_demand
-            lower = w_l * lstm_r.confidence_lower + w_x * xgb_r.confidence_lower
-            upper = w_l * lstm_r.confidence_upper + w_x * xgb_r.confidence_upper
-
-            # Compute blended MAPE using the same weights as predictions
-            cached = self._accuracy_cache.get(product_id, {})
-            lstm_mape = cached.get("lstm_mape", 0)
-            xgb_mape = cached.get("xgb_mape", 0)
-            blended_mape = round(w_l * lstm_mape + w_x * xgb_mape, 2)
-
-            results.append(ForecastResult(
+        # Blend the members' (predicted, lower, upper) bands in one pass
+        lstm_bands = np.array(self._lstm._bands(lstm_state, product_id, horizon))
+        xgb_bands = np.array(self._xgb._bands(xgb_state, product_id, horizon, first_dow))
+        demand, lower, upper = (w_l * lstm_bands + w_x * xgb_bands).round(1).tolist()
+
+        # Compute blended MAPE using the same weights as predictions
+        cached = self._accuracy_cache.get(product_id, {})
+        blended_mape = round(w_l * cached.get("lstm_mape", 0) + w_x * cached.get("xgb_mape", 0), 2)
+
+        return [
+            ForecastResult.model_construct(
                 product_id=product_id,
-                forecast_date=lstm_r.forecast_date,
-                predicted_demand=round(demand, 1),
-                confidence_lower=round(lower, 1),
-                confidence_upper=round(upper, 1),
+                forecast_date=now + timedelta(days=i + 1),
+                predicted_demand=d,
+                confidence_lower=lo,
+                confidence_upper=hi,
                 model_used="ensemble",
                 mape=blended_mape,
-            ))
-        return results
+            )
+            for i, (d, lo, hi) in enumerate(zip(demand, lower, upper, strict=True))
+        ]
 
     def get_accuracy(self, product_id: str) -> dict:
         return self._accuracy_cache.get(product_id, {
@@ -285,7 +363,7 @@ class EnsembleForecaster:
         })
 
     @staticmethod
-    def _compute_mape(actual: np.ndarray, predicted: List[float]) -> Optional[float]:
+    def _compute_mape(actual: np.ndarray, predicted: np.ndarray | List[float]) -> Optional[float]:
         """Compute Mean Absolute Percentage Error, skipping zero-demand days.
 
         Returns None when all actuals are zero (MAPE is undefined).
@@ -293,11 +371,30 @@ class EnsembleForecaster:
         n = min(len(actual), len(predicted))
         if n == 0:
             return None
-        errors = []
-        for a, p in zip(actual[:n], predicted[:n], strict=False):
-            if a > 0:
-                errors.append(abs(a - p) / a * 100)
-        return float(np.mean(errors)) if errors else None
+        a = np.asarray(actual[:n], dtype=np.float64)
+        p = np.asarray(predicted[:n], dtype=np.float64)
+        mask = a > 0
+        if not mask.any():
+            return None
+        a = a[mask]
+        return float(np.mean(np.abs(a - p[mask]) / a) * 100)
+
+
+def _train_product(rows: pd.DataFrame, product_id: str) -> tuple:
+    """Train one product on a fresh ensemble and return its state pieces.
+
+    Module-level so joblib can pickle it for worker processes. Returns
+    (lstm_state, xgb_state, weights, accuracy); model states are None when
+    the product had too little history to train.
+    """
+    model = EnsembleForecaster()
+    model._fit(rows, product_id)
+    return (
+        model._lstm._trained.get(product_id),
+        model._xgb._trained.get(product_id),
+        model._weights[product_id],
+        model._accuracy_cache.get(product_id),
+    )
 
 
 # ── v2.0: ForecastModel Protocol ─────────────────────────
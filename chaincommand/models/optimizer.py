@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import math
-import random
 from typing import Dict, List
 
 import numpy as np
@@ -11,9 +10,30 @@ import numpy as np
 from ..config import settings
 from ..data.schemas import ForecastResult, OptimizationResult, Product
 from ..utils.logging_config import get_logger
+from ._kernels import dqn_train, ga_evolve
 
 log = get_logger(__name__)
 
+# DQN state and action spaces: discretized stock level, order size
+_STOCK_LEVELS = ("critical", "low", "normal", "high")
+_ACTIONS = ("none", "small", "medium", "large")
+
+
+def _stock_level(stock: float, safety_stock: float, reorder_point: float) -> int:
+    """Index into ``_STOCK_LEVELS`` for the given stock position."""
+    if stock < safety_stock:
+        return 0
+    if stock < reorder_point:
+        return 1
+    if stock < reorder_point * 2:
+        return 2
+    return 3
+
+
+def _action_quantities(product: Product) -> np.ndarray:
+    """Order quantity for each of ``_ACTIONS``: nothing, or 1x/2x/4x the minimum order."""
+    return np.array([0, 1, 2, 4]) * product.min_order_qty
+
 
 class GeneticOptimizer:
     """GA optimization for reorder point + safety stock + order quantity."""
@@ -36,7 +56,6 @@ class GeneticOptimizer:
         demand_forecast: List[ForecastResult],
         seed: int | None = None,
     ) -> OptimizationResult:
-        rng = random.Random(seed)
         np_rng = np.random.default_rng(seed)
 
         avg_demand = product.daily_demand_avg
@@ -51,66 +70,33 @@ class GeneticOptimizer:
             std_demand = float(np.std(forecast_demands, ddof=1))
 
         # Initialize population: [reorder_point, safety_stock, order_qty]
-        population = []
-        for _ in range(self._pop_size):
-            ss = rng.uniform(0.5, 3.0) * std_demand * math.sqrt(lead_time)
-            rop = avg_demand * lead_time + ss
-            # EOQ approximation with noise
-            ordering_cost = unit_cost * self.ORDERING_COST_MULT
-            annual_demand = avg_demand * 365
-            eoq = math.sqrt(2 * annual_demand * ordering_cost / (unit_cost * holding_cost_pct))
-            oq = eoq * rng.uniform(0.7, 1.3)
-            population.append([rop, ss, max(oq, product.min_order_qty)])
+        ordering_cost = unit_cost * self.ORDERING_COST_MULT
+        annual_demand = avg_demand * 365
+        eoq = math.sqrt(2 * annual_demand * ordering_cost / (unit_cost * holding_cost_pct))
+        population = np.empty((self._pop_size, 3))
+        population[:, 1] = np_rng.uniform(0.5, 3.0, self._pop_size) * std_demand * math.sqrt(lead_time)
+        population[:, 0] = avg_demand * lead_time + population[:, 1]
+        # EOQ approximation with noise
+        population[:, 2] = np.maximum(eoq * np_rng.uniform(0.7, 1.3, self._pop_size), product.min_order_qty)
 
         # Evolution — track best individual across all generations
-        best = population[0]
-        best_fitness_val = -1.0
-
-        for _gen in range(self._generations):
-            # Fitness = minimize total cost (holding + stockout penalty + ordering)
-            fitness = []
-            for individual in population:
-                rop, ss, oq = individual
-                holding = (ss + oq / 2) * unit_cost * holding_cost_pct / 365  # daily
-                stockout_prob = max(0, 1 - ss / (std_demand * math.sqrt(lead_time) * self.STOCKOUT_Z + 0.01))
-                stockout_cost = stockout_prob * avg_demand * product.selling_price * 30 * self.STOCKOUT_PENALTY
-                ordering_freq = max(avg_demand * 30 / max(oq, 1), 0.1)
-                ordering_total = ordering_freq * unit_cost * self.ORDERING_FREQ_COST
-
-                cost = holding + stockout_cost + ordering_total
-                fitness.append(1 / (cost + 1))
-
-            # Track best individual before population is replaced
-            gen_best_idx = int(np.argmax(fitness))
-            if fitness[gen_best_idx] > best_fitness_val:
-                best_fitness_val = fitness[gen_best_idx]
-                best = list(population[gen_best_idx])
-
-            # Selection + crossover
-            total_fitness = sum(fitness)
-            probs = [f / total_fitness for f in fitness]
-            new_pop = []
-            for _ in range(self._pop_size):
-                # Roulette-wheel (fitness-proportionate) selection
-                idx = int(np_rng.choice(len(population), p=probs))
-                parent1 = population[idx]
-                idx2 = int(np_rng.choice(len(population), p=probs))
-                parent2 = population[idx2]
-
-                # Single-point crossover
-                crossover_point = rng.randint(1, 2)
-                child = list(parent1[:crossover_point] + parent2[crossover_point:])
-                # Mutation
-                for j in range(3):
-                    if rng.random() < self.MUTATION_RATE:
-                        child[j] += rng.gauss(0, std_demand * 0.2)
-                child = [max(1, c) for c in child]
-                child[2] = max(child[2], product.min_order_qty)
-                new_pop.append(child)
-
-            # Elitism: preserve best individual from previous generation
-            new_pop[0] = list(best)
-            population = new_pop
+        best, _ = ga_evolve(
+            population,
+            self._generations,
+            float(avg_demand),
+            float(std_demand),
+            float(lead_time),
+            float(unit_cost),
+            float(product.selling_price),
+            float(product.min_order_qty),
+            holding_cost_pct,
+            self.STOCKOUT_Z,
+            self.STOCKOUT_PENALTY,
+            float(self.ORDERING_FREQ_COST),
+            self.MUTATION_RATE,
+            np_rng,
+        )
+        best = best.tolist()
 
         # Estimate savings vs current
         current_holding = (product.safety_stock + product.current_stock / 2) * unit_cost * holding_cost_pct / 365
@@ -146,105 +132,57 @@ class DQNOptimizer:
             self._epsilon_decay = (self._epsilon_end / self._epsilon) ** (1.0 / self._episodes)
         else:
             self._epsilon_decay = settings.dqn_epsilon_decay
-        self._q_tables: Dict[str, Dict[str, Dict[str, float]]] = {}  # product_id -> state_key -> action -> value
+        self._q_tables: Dict[str, np.ndarray] = {}  # product_id -> (stock level, action) values
+        self._visited: Dict[str, np.ndarray] = {}  # product_id -> stock levels seen in training
         self._trained = False
 
     def train(self, product: Product, seed: int | None = None) -> None:
         """Train DQN on simulated inventory environment."""
-        rng = random.Random(seed)
+        rng = np.random.default_rng(seed)
 
         pid = product.product_id
         avg_demand = product.daily_demand_avg
-        std_demand = product.daily_demand_std
+        std_demand = abs(product.daily_demand_std)
 
         # Per-product Q-table
-        if pid not in self._q_tables:
-            self._q_tables[pid] = {}
-        q_table = self._q_tables[pid]
-
-        # Actions: order_nothing, order_small, order_medium, order_large
-        actions = ["none", "small", "medium", "large"]
-        action_qtys = {
-            "none": 0,
-            "small": product.min_order_qty,
-            "medium": product.min_order_qty * 2,
-            "large": product.min_order_qty * 4,
-        }
-
-        epsilon = self._epsilon
-        for _ep in range(self._episodes):
-            stock = product.current_stock
-            total_reward = 0
-
-            for _day in range(30):
-                # State discretization
-                stock_level = "critical" if stock < product.safety_stock else \
-                              "low" if stock < product.reorder_point else \
-                              "normal" if stock < product.reorder_point * 2 else "high"
-                state_key = stock_level
-
-                # Epsilon-greedy action
-                if rng.random() < epsilon:
-                    action = rng.choice(actions)
-                else:
-                    q_vals = q_table.get(state_key, {a: 0.0 for a in actions})
-                    action = max(q_vals, key=q_vals.get)
-
-                # Simulate
-                demand = max(0, rng.gauss(avg_demand, std_demand))
-                order_qty = action_qtys[action]
-                stock = stock + order_qty - demand
-
-                # Reward: penalize stockouts and excess holding
-                reward = 0
-                if stock < 0:
-                    reward -= abs(stock) * product.selling_price * 0.5  # stockout penalty
-                    stock = 0
-                else:
-                    reward -= stock * product.unit_cost * 0.001  # holding cost
-
-                if order_qty > 0:
-                    reward -= order_qty * product.unit_cost * 0.01  # ordering cost
-
-                # Update Q-table (Bellman equation)
-                if state_key not in q_table:
-                    q_table[state_key] = {a: 0.0 for a in actions}
-                lr = 0.1
-                gamma = 0.95
-                old_q = q_table[state_key].get(action, 0)
-
-                # Compute next state for bootstrapping
-                next_stock_level = (
-                    "critical" if stock < product.safety_stock else
-                    "low" if stock < product.reorder_point else
-                    "normal" if stock < product.reorder_point * 2 else "high"
-                )
-                next_q_vals = q_table.get(
-                    next_stock_level, {a: 0.0 for a in actions},
-                )
-                max_next_q = max(next_q_vals.values()) if next_q_vals else 0.0
-
-                q_table[state_key][action] = (
-                    old_q + lr * (reward + gamma * max_next_q - old_q)
-                )
-
-                total_reward += reward
-
-            epsilon = max(self._epsilon_end, epsilon * self._epsilon_decay)
+        q_table = self._q_tables.setdefault(pid, np.zeros((len(_STOCK_LEVELS), len(_ACTIONS))))
+        visited = self._visited.setdefault(pid, np.zeros(len(_STOCK_LEVELS), dtype=bool))
+
+        # Draw every episode's randomness up front so the training loop itself
+        # is pure arithmetic (compiled by Numba when available)
+        n_days = 30
+        epsilons = np.maximum(
+            self._epsilon_end, self._epsilon * self._epsilon_decay ** np.arange(self._episodes)
+        )
+        explore = rng.random((self._episodes, n_days)) < epsilons[:, None]
+        random_actions = rng.integers(len(_ACTIONS), size=(self._episodes, n_days))
+        demands = np.maximum(rng.normal(avg_demand, std_demand, (self._episodes, n_days)), 0.0)
+
+        dqn_train(
+            q_table,
+            visited,
+            float(product.current_stock),
+            float(product.safety_stock),
+            float(product.reorder_point),
+            float(product.selling_price),
+            float(product.unit_cost),
+            _action_quantities(product).astype(np.float64),
+            explore,
+            random_actions,
+            demands,
+            0.1,   # learning rate
+            0.95,  # discount factor
+        )
 
         self._trained = True
         log.info("dqn_trained", product_id=pid, episodes=self._episodes)
 
     def decide(self, product: Product) -> OptimizationResult:
         pid = product.product_id
-        stock = product.current_stock
-        stock_level = "critical" if stock < product.safety_stock else \
-                      "low" if stock < product.reorder_point else \
-                      "normal" if stock < product.reorder_point * 2 else "high"
-
-        q_table = self._q_tables.get(pid, {})
-        q_vals = q_table.get(stock_level, {})
-        if not q_vals:
+        state = _stock_level(product.current_stock, product.safety_stock, product.reorder_point)
+
+        q_table = self._q_tables.get(pid)
+        if q_table is None or not self._visited[pid][state]:
             # Fallback
             return OptimizationResult(
                 product_id=product.product_id,
@@ -253,19 +191,12 @@ class DQNOptimizer:
                 recommended_order_qty=float(product.min_order_qty),
             )
 
-        best_action = max(q_vals, key=q_vals.get)
-        qty_map = {
-            "none": 0,
-            "small": product.min_order_qty,
-            "medium": product.min_order_qty * 2,
-            "large": product.min_order_qty * 4,
-        }
-
+        best_action = int(np.argmax(q_table[state]))
         return OptimizationResult(
             product_id=product.product_id,
             recommended_reorder_point=product.reorder_point,
             recommended_safety_stock=product.safety_stock,
-            recommended_order_qty=float(qty_map.get(best_action, product.min_order_qty)),
+            recommended_order_qty=float(_action_quantities(product)[best_action]),
             method="dqn",
         )
 
@@ -3,15 +3,23 @@
 from __future__ import annotations
 
 import asyncio
-import random
+import operator
 import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Deque, Dict, List, Optional, Set
 
+import numpy as np
 import pandas as pd
+from structlog.contextvars import bound_contextvars
 
+from .aws import NullBackend, get_backend
+from .bom import BOMManager
 from .config import settings
+from .ctb import CTBAnalyzer
+from .data.generator import generate_all_cached, make_sim_rng
 from .data.schemas import (
     HumanApprovalRequest,
     OrderStatus,
@@ -19,20 +27,34 @@ from .data.schemas import (
     PurchaseOrder,
     Supplier,
 )
+from .events.bus import EventBus
+from .events.monitor import ProactiveMonitor
+from .optimization.cpsat_optimizer import SupplierAllocationOptimizer, SupplierCandidate
 from .utils.logging_config import get_logger, setup_logging
 
+# The scikit-learn backed modules (forecasting, anomaly detection, KPI and
+# risk scoring) and the RL policy (stable-baselines3/torch when the ``rl``
+# extra is installed) are imported inside initialize(): the API and CLI
+# should not pay for them just to import this module.
+
 log = get_logger(__name__)
 
 
 # ── Runtime state (singleton) ───────────────────────────────
 
-@dataclass
+_TERMINAL_PO_STATUSES = frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED})
+
+
+@dataclass(slots=True)
 class _RuntimeState:
     """Mutable global state shared across modules and API."""
 
     products: Optional[List[Product]] = None
     suppliers: Optional[List[Supplier]] = None
     demand_df: Optional[pd.DataFrame] = None
+    # ID indexes over the catalog above; kept in step by _set_catalog()
+    products_by_id: Dict[str, Product] = field(default_factory=dict)
+    suppliers_by_id: Dict[str, Supplier] = field(default_factory=dict)
 
     # ML models  (typed as Optional for clarity; actual types are module-local)
     forecaster: Optional[Any] = None
@@ -51,7 +73,9 @@ class _RuntimeState:
     ctb_analyzer: Optional[Any] = None
 
     # Transaction state
-    purchase_orders: List[PurchaseOrder] = field(default_factory=list)
+    # Trimmed by trim_purchase_orders(): every cycle walks all orders
+    # (fulfilment, KPIs, persistence)
+    purchase_orders: Deque[PurchaseOrder] = field(default_factory=deque)
     pending_approvals: Dict[str, HumanApprovalRequest] = field(default_factory=dict)
 
     # Results cache
@@ -66,6 +90,31 @@ class _RuntimeState:
     # Persistence backend
     backend: Any = None
 
+    def trim_purchase_orders(self) -> None:
+        """Drop the oldest delivered/cancelled orders beyond ``max_po_history``.
+
+        Open orders are never dropped, so their inbound stock is still
+        credited when they arrive.
+        """
+        orders = self.purchase_orders
+        limit = settings.max_po_history
+        overflow = len(orders) - limit
+        if not limit or overflow <= 0:
+            return
+        while overflow and orders[0].status in _TERMINAL_PO_STATUSES:
+            orders.popleft()
+            overflow -= 1
+        if not overflow:
+            return
+        kept = []
+        for po in orders:
+            if overflow and po.status in _TERMINAL_PO_STATUSES:
+                overflow -= 1
+            else:
+                kept.append(po)
+        orders.clear()
+        orders.extend(kept)
+
 
 _runtime = _RuntimeState()
 _runtime_lock: asyncio.Lock | None = None
@@ -81,8 +130,7 @@ def _get_runtime_lock() -> asyncio.Lock:
 
 def _reset_runtime_state() -> None:
     """Reset shared runtime state to a clean baseline."""
-    _runtime.products = None
-    _runtime.suppliers = None
+    _set_catalog(None, None)
     _runtime.demand_df = None
     _runtime.forecaster = None
     _runtime.anomaly_detector = None
@@ -96,17 +144,42 @@ def _reset_runtime_state() -> None:
     _runtime.ctb_analyzer = None
     _runtime.purchase_orders.clear()
     _runtime.pending_approvals.clear()
-    _runtime.last_cycle_results.clear()
+    # Rebind rather than clear: run_cycle hands the same dict to its caller
+    _runtime.last_cycle_results = {}
     _runtime.runtime_config = {"simulation_speed": settings.simulation_speed}
     _runtime.backend = None
 
 
+def _set_catalog(products: Optional[List[Product]], suppliers: Optional[List[Supplier]]) -> None:
+    """Install the product/supplier catalog together with its ID indexes."""
+    _runtime.products = products
+    _runtime.suppliers = suppliers
+    _runtime.products_by_id = {p.product_id: p for p in products or ()}
+    # First supplier wins on duplicate IDs, like a linear scan would
+    _runtime.suppliers_by_id = {s.supplier_id: s for s in reversed(suppliers or ())}
+
+
+def _suppliers_by_product(suppliers: List[Supplier], product_ids: Set[str]) -> Dict[str, List[Supplier]]:
+    """Group ``suppliers`` under each of ``product_ids`` they supply, in catalog order."""
+    by_product: Dict[str, List[Supplier]] = {}
+    for s in suppliers:
+        for product_id in dict.fromkeys(s.products):  # once per supplier
+            if product_id in product_ids:
+                by_product.setdefault(product_id, []).append(s)
+    return by_product
+
+
 # ── Orchestrator ────────────────────────────────────────────
 
 class ChainCommandOrchestrator:
     """Main orchestrator: initializes modules, runs optimization cycles."""
 
     STAGES = ["data", "ml", "engines", "bom", "rl", "risk", "kpi"]
+    # Independent per-cycle analysis steps, in result order
+    ANALYSIS_STEPS = ("_step_anomalies", "_step_risk", "_step_allocations", "_step_rl", "_step_ctb")
+
+    _instance: ClassVar[Optional[ChainCommandOrchestrator]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(self, on_progress: Any = None) -> None:
         self._running = False
@@ -114,7 +187,33 @@ class ChainCommandOrchestrator:
         self._cycle_count = 0
         self._loop_task: Optional[asyncio.Task] = None
         self._loop_lock = asyncio.Lock()
+        # In-flight persist_cycle tasks; awaited on shutdown
+        self._persist_tasks: Set[asyncio.Task] = set()
+        # Order status as of the last persisted cycle, so each upload only
+        # carries orders that are new or changed since then
+        self._persisted_po_status: Dict[str, OrderStatus] = {}
+        # Caps how many analysis steps occupy worker threads at once
+        self._step_slots = asyncio.Semaphore(max(1, settings.max_step_concurrency))
         self._on_progress = on_progress or (lambda *a, **kw: None)
+        # Simulation randomness; reseeded on every initialize() so runs repeat
+        self._rng = make_sim_rng(settings.random_seed)
+        # Per-product demand parameters for the consumption step; they only
+        # change with the catalog, so they are reused while the same Product
+        # objects are in play
+        self._demand_catalog: List[Product] = []
+        self._demand_avg = np.empty(0)
+        self._demand_std = np.empty(0)
+
+    @classmethod
+    def instance(cls) -> ChainCommandOrchestrator:
+        """Return the process-wide orchestrator, creating it on first use."""
+        orchestrator = cls._instance
+        if orchestrator is None:
+            with cls._instance_lock:
+                orchestrator = cls._instance
+                if orchestrator is None:
+                    orchestrator = cls._instance = cls()
+        return orchestrator
 
     @property
     def running(self) -> bool:
@@ -136,19 +235,17 @@ class ChainCommandOrchestrator:
             return
 
         setup_logging()
-        self._rng = random.Random(settings.random_seed)
+        self._rng = make_sim_rng(settings.random_seed)
         self._running = False
         self._cycle_count = 0
+        self._persisted_po_status = {}
         _reset_runtime_state()
         log.info("initializing")
 
         # Phase 0: Generate synthetic data
         self._on_progress("data", "running", {})
-        from .data.generator import generate_all
-
-        products, suppliers, demand_df = generate_all(rng=self._rng)
-        _runtime.products = products
-        _runtime.suppliers = suppliers
+        products, suppliers, demand_df = generate_all_cached(settings.random_seed)
+        _set_catalog(products, suppliers)
         _runtime.demand_df = demand_df
         log.info("data_generated", products=len(products), suppliers=len(suppliers))
         self._on_progress("data", "completed", {"products": len(products), "suppliers": len(suppliers)})
@@ -159,19 +256,25 @@ class ChainCommandOrchestrator:
         from .models.forecaster import EnsembleForecaster
         from .models.optimizer import HybridOptimizer
 
-        _runtime.forecaster = EnsembleForecaster()
+        # Model training is CPU-bound: it runs on worker threads so the event
+        # loop (API, health checks) stays responsive, and the two independent
+        # trainings overlap where cores allow. Each thread gets its own frame,
+        # and the models are only published once both have finished training.
+        forecaster = EnsembleForecaster()
+        anomaly_detector = AnomalyDetector()
         product_ids = [p.product_id for p in products[:settings.max_train_products]]
-        _runtime.forecaster.train_all(demand_df, product_ids)
-        _runtime.anomaly_detector = AnomalyDetector()
-        _runtime.anomaly_detector.train(demand_df)
+        await asyncio.gather(
+            asyncio.to_thread(forecaster.train_all, demand_df, product_ids),
+            asyncio.to_thread(anomaly_detector.train, demand_df.copy()),
+        )
+        _runtime.forecaster = forecaster
+        _runtime.anomaly_detector = anomaly_detector
         _runtime.optimizer = HybridOptimizer()
         log.info("ml_models_trained")
         self._on_progress("ml", "completed", {})
 
         # Phase 2: Initialize engines
         self._on_progress("engines", "running", {})
-        from .events.bus import EventBus
-        from .events.monitor import ProactiveMonitor
         from .kpi.engine import KPIEngine
 
         _runtime.kpi_engine = KPIEngine()
@@ -184,8 +287,6 @@ class ChainCommandOrchestrator:
 
         # Phase 3: BOM Management
         self._on_progress("bom", "running", {})
-        from .bom import BOMManager
-
         _runtime.bom_manager = BOMManager()
         _runtime.bom_manager.generate_synthetic_boms(
             n_assemblies=settings.bom_default_assemblies,
@@ -210,7 +311,8 @@ class ChainCommandOrchestrator:
             ordering_cost_fixed=settings.rl_ordering_cost_fixed,
         )
         _runtime.rl_policy = RLInventoryPolicy(rl_config)
-        rl_result = _runtime.rl_policy.train(
+        rl_result = await asyncio.to_thread(
+            _runtime.rl_policy.train,
             total_timesteps=settings.rl_total_timesteps,
             seed=settings.random_seed,
         )
@@ -232,7 +334,7 @@ class ChainCommandOrchestrator:
         _runtime.risk_scorer = SupplierRiskScorer()
         # Train ML risk model on synthetic history
         history = _runtime.risk_scorer.generate_synthetic_history(n_suppliers=100, seed=settings.random_seed)
-        _runtime.risk_scorer.train_ml_model(history, seed=settings.random_seed)
+        await asyncio.to_thread(_runtime.risk_scorer.train_ml_model, history, seed=settings.random_seed)
         log.info("risk_scorer_initialized")
         self._on_progress("risk", "completed", {})
 
@@ -246,8 +348,6 @@ class ChainCommandOrchestrator:
         self._on_progress("kpi", "completed", {})
 
         # Phase 7: AWS backend
-        from .aws import get_backend
-
         _runtime.backend = get_backend()
         await _runtime.backend.setup()
         if _runtime.demand_df is not None:
@@ -259,135 +359,83 @@ class ChainCommandOrchestrator:
     async def run_cycle(self) -> Dict[str, Any]:
         """Execute one optimization cycle."""
         async with _get_runtime_lock():
-            return await self._run_cycle_locked()
+            self._cycle_count += 1
+            # Every log line emitted during the cycle, including those from
+            # worker threads and backends, carries the cycle number
+            with bound_contextvars(cycle=self._cycle_count):
+                return await self._run_cycle_locked()
 
     async def _run_cycle_locked(self) -> Dict[str, Any]:
         """Execute one optimization cycle (caller must hold _runtime_lock)."""
-        self._cycle_count += 1
-        log.info("cycle_start", cycle=self._cycle_count)
+        log.debug("cycle_start")
+        started = time.perf_counter()
+        step_ms: Dict[str, float] = {}
 
         products = _runtime.products or []
         suppliers = _runtime.suppliers or []
+        purchase_orders = _runtime.purchase_orders
+        kpi_engine = _runtime.kpi_engine
+        event_bus = _runtime.event_bus
+        backend = _runtime.backend
         results: Dict[str, Any] = {"cycle": self._cycle_count}
 
-        # Step 1: Anomaly detection
-        if _runtime.anomaly_detector and _runtime.demand_df is not None:
-            anomalies = _runtime.anomaly_detector.detect_batch(products[:10])
-            results["anomalies"] = len(anomalies) if anomalies else 0
-
-        # Step 2: Risk scoring for suppliers
-        if _runtime.risk_scorer and suppliers:
-            from .risk.scorer import SupplierMetrics
-
-            risk_scores = []
-            for s in suppliers[:10]:
-                metrics = SupplierMetrics(
-                    supplier_id=s.supplier_id,
-                    on_time_rate=s.on_time_rate,
-                    defect_rate=s.defect_rate,
-                    lead_time_mean=s.lead_time_mean,
-                    lead_time_std=s.lead_time_std,
-                )
-                score = _runtime.risk_scorer.score_supplier(metrics)
-                risk_scores.append(score)
-
-            high_risk = sum(1 for r in risk_scores if r.risk_level in ("high", "critical"))
-            results["risk"] = {
-                "scored": len(risk_scores),
-                "high_risk_count": high_risk,
-            }
-
-        # Step 3: CP-SAT supplier allocation for low-stock products
-        low_stock = [p for p in products if p.current_stock < p.reorder_point]
-        if low_stock:
-            from .optimization.cpsat_optimizer import SupplierAllocationOptimizer, SupplierCandidate
-
-            allocator = SupplierAllocationOptimizer()
-            for product in low_stock[:5]:
-                candidates = []
-                for s in suppliers:
-                    if product.product_id in s.products:
-                        candidates.append(SupplierCandidate(
-                            supplier_id=s.supplier_id,
-                            unit_cost=product.unit_cost * s.cost_multiplier,
-                            risk_score=1.0 - s.reliability_score,
-                            capacity=s.capacity,
-                            min_order_qty=float(product.min_order_qty),
-                            lead_time_days=s.lead_time_mean,
-                        ))
-                if candidates:
-                    alloc = allocator.optimize(candidates, product.daily_demand_avg * 30)
-                    results.setdefault("allocations", []).append({
-                        "product_id": product.product_id,
-                        "status": alloc.solver_status,
-                        "total_cost": alloc.total_cost,
-                    })
-
-        # Step 4: RL inventory decisions
-        if _runtime.rl_policy:
-            rl_decisions = []
-            for p in products[:10]:
-                decision = _runtime.rl_policy.decide(
-                    current_stock=p.current_stock,
-                    avg_demand=p.daily_demand_avg,
-                )
-                rl_decisions.append({
-                    "product_id": p.product_id,
-                    "action": decision.action,
-                    "order_qty": decision.order_quantity,
-                    "method": decision.method,
-                })
-            results["rl_decisions"] = len(rl_decisions)
-
-        # Step 5: CTB analysis
+        # Steps 1-5: analysis. The steps only read runtime state and do not
+        # depend on each other, so they run concurrently on worker threads
+        # (sklearn, OR-Tools and numpy release the GIL for much of their work)
+        # and their results are merged in pipeline order.
         if _runtime.bom_manager and _runtime.ctb_analyzer is None:
-            from .ctb import CTBAnalyzer
             _runtime.ctb_analyzer = CTBAnalyzer()
-
-        if _runtime.ctb_analyzer and _runtime.bom_manager:
-            ctb_reports = []
-            for assembly_id, tree in list(_runtime.bom_manager.assemblies.items())[:3]:
-                # Build inventory from current product stock
-                inventory = {p.product_id: p.current_stock for p in products}
-                roots = tree.root_items
-                for root in roots:
-                    report = _runtime.ctb_analyzer.analyze(
-                        tree, root.part_id, settings.ctb_default_build_qty, inventory,
-                    )
-                    ctb_reports.append({
-                        "assembly_id": assembly_id,
-                        "is_clear": report.is_clear,
-                        "clear_pct": report.clear_percentage,
-                        "shortages": len(report.shortages),
-                    })
-            results["ctb"] = ctb_reports
+        # A failing step is logged and skipped; it does not cancel its siblings
+        step_results = await asyncio.gather(*(
+            self._run_step(getattr(self, step), products, suppliers, step_ms)
+            for step in self.ANALYSIS_STEPS
+        ), return_exceptions=True)
+        for step, partial in zip(self.ANALYSIS_STEPS, step_results, strict=True):
+            if isinstance(partial, Exception):
+                log.error("cycle_step_error", step=step, error=str(partial), exc_type=type(partial).__name__)
+            elif isinstance(partial, BaseException):
+                raise partial
+            else:
+                results.update(partial)
 
         # Step 6: KPI update
-        snapshot = _runtime.kpi_engine.calculate_snapshot(
-            products, _runtime.purchase_orders, suppliers,
+        snapshot = kpi_engine.calculate_snapshot(
+            products, purchase_orders, suppliers,
             forecaster=_runtime.forecaster,
         )
-        violations = _runtime.kpi_engine.check_thresholds(snapshot)
-        for event in violations:
-            if _runtime.event_bus:
-                await _runtime.event_bus.publish(event)
-
-        # Persist cycle data
-        if _runtime.backend:
-            await _runtime.backend.persist_cycle(
+        violations = kpi_engine.check_thresholds(snapshot)
+        if event_bus and violations:
+            await event_bus.publish_many(violations)
+
+        # Persist cycle data in the background: nothing later in the cycle
+        # depends on it. Only orders new or changed since the last upload are
+        # sent, copied because fulfilment below updates them before the
+        # upload gets to serialize them; backends only count products.
+        if backend and not isinstance(backend, NullBackend):
+            if self._persist_tasks:
+                # At most one upload in flight: a backend slower than the tick
+                # holds the loop back instead of piling up tasks
+                await asyncio.gather(*self._persist_tasks, return_exceptions=True)
+            last_status = self._persisted_po_status
+            changed_pos = [po.model_copy() for po in purchase_orders if last_status.get(po.po_id) != po.status]
+            self._persisted_po_status = {po.po_id: po.status for po in purchase_orders}
+            task = asyncio.create_task(backend.persist_cycle(
                 cycle=self._cycle_count,
                 kpi=snapshot,
-                events=list(_runtime.event_bus.recent_events[-50:]) if _runtime.event_bus else [],
-                pos=_runtime.purchase_orders,
-                products=products,
-                suppliers=suppliers,
-            )
+                events=event_bus.events_tail(50) if event_bus else [],
+                pos=changed_pos,
+                products=[p.product_id for p in products],
+                suppliers=list(suppliers),
+            ))
+            self._persist_tasks.add(task)
+            task.add_done_callback(self._persist_done)
 
         # Fulfill purchase orders whose lead time has elapsed
         now = datetime.now(UTC)
-        product_map = {p.product_id: p for p in products}
+        products_by_id = _runtime.products_by_id
+        suppliers_by_id = _runtime.suppliers_by_id
         fulfilled_count = 0
-        for po in _runtime.purchase_orders:
+        for po in purchase_orders:
             if po.status in (OrderStatus.PENDING, OrderStatus.APPROVED, OrderStatus.SHIPPED):
                 # Determine if enough time has passed since PO creation
                 created = po.created_at
@@ -400,14 +448,12 @@ class ChainCommandOrchestrator:
                         delivery = delivery.replace(tzinfo=UTC)
                 else:
                     # Estimate delivery based on supplier lead time
-                    supplier = next(
-                        (s for s in suppliers if s.supplier_id == po.supplier_id), None
-                    )
+                    supplier = suppliers_by_id.get(po.supplier_id)
                     lead_days = supplier.lead_time_mean if supplier else 7.0
                     delivery = created + timedelta(days=lead_days)
 
                 if now >= delivery:
-                    product = product_map.get(po.product_id)
+                    product = products_by_id.get(po.product_id)
                     if product:
                         product.current_stock += po.quantity
                         fulfilled_count += 1
@@ -415,19 +461,178 @@ class ChainCommandOrchestrator:
 
         if fulfilled_count:
             log.info("po_fulfilled", count=fulfilled_count)
+        _runtime.trim_purchase_orders()
 
-        # Simulate demand consumption
-        for p in products:
-            consumed = max(0, self._rng.gauss(p.daily_demand_avg, p.daily_demand_std))
-            p.current_stock = max(0, p.current_stock - consumed)
+        # Simulate demand consumption (one batched draw for the whole catalogue)
+        demand_avg, demand_std = self._demand_arrays(products)
+        stock = np.fromiter((p.current_stock for p in products), np.float64, len(products))
+        consumed = np.maximum(self._rng.normal(demand_avg, demand_std), 0.0)
+        for p, level in zip(products, np.maximum(stock - consumed, 0.0).tolist(), strict=True):
+            p.current_stock = level
 
-        results["kpi"] = snapshot.model_dump()
+        # Shallow field copy; model_dump() would walk and re-serialize every value
+        results["kpi"] = dict(snapshot)
         results["violations"] = len(violations)
         _runtime.last_cycle_results = results
 
-        log.info("cycle_complete", cycle=self._cycle_count, violations=len(violations))
+        # One summary line per cycle, carrying the per-step timings
+        log.info(
+            "cycle_complete",
+            violations=len(violations),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            step_ms=step_ms,
+        )
         return results
 
+    def _persist_done(self, task: asyncio.Task) -> None:
+        """Forget a finished persist task and log its failure, if any."""
+        self._persist_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            log.error("persist_cycle_error", error=str(exc), exc_type=type(exc).__name__)
+
+    async def _run_step(
+        self,
+        step: Any,
+        products: List[Product],
+        suppliers: List[Supplier],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """Run one analysis step on a worker thread once a step slot is free.
+
+        When ``timings`` is given, the step's wall time in milliseconds is
+        recorded under its name (without the ``_step_`` prefix).
+        """
+        async with self._step_slots:
+            started = time.perf_counter()
+            try:
+                return await asyncio.to_thread(step, products, suppliers)
+            finally:
+                if timings is not None:
+                    timings[step.__name__.removeprefix("_step_")] = round((time.perf_counter() - started) * 1000, 1)
+
+    @staticmethod
+    def _step_anomalies(products: List[Product], suppliers: List[Supplier]) -> Dict[str, Any]:
+        """Step 1: anomaly detection on the first products."""
+        anomaly_detector = _runtime.anomaly_detector
+        if not anomaly_detector or _runtime.demand_df is None:
+            return {}
+        anomalies = anomaly_detector.detect_batch(products[:10])
+        return {"anomalies": len(anomalies) if anomalies else 0}
+
+    @staticmethod
+    def _step_risk(products: List[Product], suppliers: List[Supplier]) -> Dict[str, Any]:
+        """Step 2: risk scoring for suppliers."""
+        risk_scorer = _runtime.risk_scorer
+        if not risk_scorer or not suppliers:
+            return {}
+        from .risk.scorer import SupplierMetrics
+
+        risk_scores = []
+        for s in suppliers[:10]:
+            metrics = SupplierMetrics(
+                supplier_id=s.supplier_id,
+                on_time_rate=s.on_time_rate,
+                defect_rate=s.defect_rate,
+                lead_time_mean=s.lead_time_mean,
+                lead_time_std=s.lead_time_std,
+            )
+            score = risk_scorer.score_supplier(metrics)
+            risk_scores.append(score)
+
+        high_risk = sum(1 for r in risk_scores if r.risk_level in ("high", "critical"))
+        return {"risk": {
+            "scored": len(risk_scores),
+            "high_risk_count": high_risk,
+        }}
+
+    @staticmethod
+    def _step_allocations(products: List[Product], suppliers: List[Supplier]) -> Dict[str, Any]:
+        """Step 3: CP-SAT supplier allocation for low-stock products."""
+        low_stock = [p for p in products if p.current_stock < p.reorder_point]
+        if not low_stock:
+            return {}
+        low_stock = low_stock[:5]
+        allocator = SupplierAllocationOptimizer()
+        suppliers_by_product = _suppliers_by_product(suppliers, {p.product_id for p in low_stock})
+        allocations = []
+        for product in low_stock:
+            candidates = [
+                SupplierCandidate(
+                    supplier_id=s.supplier_id,
+                    unit_cost=product.unit_cost * s.cost_multiplier,
+                    risk_score=1.0 - s.reliability_score,
+                    capacity=s.capacity,
+                    min_order_qty=float(product.min_order_qty),
+                    lead_time_days=s.lead_time_mean,
+                )
+                for s in suppliers_by_product.get(product.product_id, ())
+            ]
+            if candidates:
+                alloc = allocator.optimize(candidates, product.daily_demand_avg * 30)
+                allocations.append({
+                    "product_id": product.product_id,
+                    "status": alloc.solver_status,
+                    "total_cost": alloc.total_cost,
+                })
+        return {"allocations": allocations} if allocations else {}
+
+    @staticmethod
+    def _step_rl(products: List[Product], suppliers: List[Supplier]) -> Dict[str, Any]:
+        """Step 4: RL inventory decisions."""
+        rl_policy = _runtime.rl_policy
+        if not rl_policy:
+            return {}
+        rl_decisions = []
+        for p in products[:10]:
+            decision = rl_policy.decide(
+                current_stock=p.current_stock,
+                avg_demand=p.daily_demand_avg,
+            )
+            rl_decisions.append({
+                "product_id": p.product_id,
+                "action": decision.action,
+                "order_qty": decision.order_quantity,
+                "method": decision.method,
+            })
+        return {"rl_decisions": len(rl_decisions)}
+
+    @staticmethod
+    def _step_ctb(products: List[Product], suppliers: List[Supplier]) -> Dict[str, Any]:
+        """Step 5: clear-to-build analysis for the first assemblies."""
+        bom_manager = _runtime.bom_manager
+        ctb_analyzer = _runtime.ctb_analyzer
+        if not ctb_analyzer or not bom_manager:
+            return {}
+        ctb_reports = []
+        # Build inventory from current product stock (unchanged across assemblies)
+        inventory = {p.product_id: p.current_stock for p in products}
+        for assembly_id, tree in list(bom_manager.assemblies.items())[:3]:
+            for root in tree.root_items:
+                report = ctb_analyzer.analyze(
+                    tree, root.part_id, settings.ctb_default_build_qty, inventory,
+                )
+                ctb_reports.append({
+                    "assembly_id": assembly_id,
+                    "is_clear": report.is_clear,
+                    "clear_pct": report.clear_percentage,
+                    "shortages": len(report.shortages),
+                })
+        return {"ctb": ctb_reports}
+
+    def _demand_arrays(self, products: List[Product]) -> tuple[np.ndarray, np.ndarray]:
+        """Return (mean, std) daily demand arrays, rebuilt only on catalog change."""
+        cached = self._demand_catalog
+        if len(cached) != len(products) or not all(map(operator.is_, cached, products)):
+            self._demand_catalog = list(products)
+            self._demand_avg = np.fromiter((p.daily_demand_avg for p in products), np.float64, len(products))
+            self._demand_std = np.fromiter(
+                (abs(p.daily_demand_std) for p in products), np.float64, len(products)
+            )
+        return self._demand_avg, self._demand_std
+
     async def start_loop(self) -> bool:
         """Start the simulation loop once."""
         async with self._loop_lock:
@@ -450,20 +655,38 @@ class ChainCommandOrchestrator:
         if _runtime.monitor:
             await _runtime.monitor.start()
 
+        # Static settings are read once; only the speed can change while running
+        tick_seconds = settings.event_tick_seconds
+        default_speed = settings.simulation_speed
+        min_speed, max_speed = settings.simulation_speed_min, settings.simulation_speed_max
+
+        # Cycles start on a fixed schedule (an absolute deadline advanced by one
+        # interval per cycle), so the time spent inside a cycle does not
+        # stretch the period
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time()
+
         log.info("simulation_loop_started")
         try:
             while self._running:
                 try:
                     await self.run_cycle()
-                    speed = _runtime.runtime_config.get("simulation_speed", settings.simulation_speed)
-                    speed = max(settings.simulation_speed_min, min(speed, settings.simulation_speed_max))
-                    interval = settings.event_tick_seconds * 2 / speed
-                    await asyncio.sleep(interval)
+                    speed = _runtime.runtime_config.get("simulation_speed", default_speed)
+                    speed = max(min_speed, min(speed, max_speed))
+                    next_deadline += tick_seconds * 2 / speed
+                    delay = next_deadline - loop.time()
+                    if delay < 0:
+                        # Overran: skip the missed ticks instead of running them back to back
+                        log.warning("cycle_overran", behind_seconds=round(-delay, 3))
+                        next_deadline -= delay
+                        delay = 0.0
+                    await asyncio.sleep(delay)
                 except asyncio.CancelledError:
                     raise
                 except Exception as exc:
                     log.error("cycle_error", error=str(exc), exc_type=type(exc).__name__)
                     await asyncio.sleep(5)
+                    next_deadline = loop.time()
         except asyncio.CancelledError:
             log.info("simulation_loop_cancelled")
             raise
@@ -507,6 +730,9 @@ class ChainCommandOrchestrator:
             return
 
         self._running = False
+        if self._persist_tasks:
+            # Let queued cycle uploads finish before the backend closes
+            await asyncio.gather(*self._persist_tasks, return_exceptions=True)
         if _runtime.backend:
             await _runtime.backend.teardown()
         if _runtime.monitor:
@@ -521,15 +747,6 @@ class ChainCommandOrchestrator:
 
 # ── Singleton ───────────────────────────────────────────────
 
-_orchestrator: Optional[ChainCommandOrchestrator] = None
-_orchestrator_lock = threading.Lock()
-
-
 def get_orchestrator() -> ChainCommandOrchestrator:
     """Get or create the orchestrator singleton (thread-safe)."""
-    global _orchestrator
-    if _orchestrator is None:
-        with _orchestrator_lock:
-            if _orchestrator is None:
-                _orchestrator = ChainCommandOrchestrator()
-    return _orchestrator
+    return ChainCommandOrchestrator.instance()
@@ -63,6 +63,8 @@ class SupplierRiskScorer:
         "geographic": 0.10,
         "concentration": 0.15,
     }
+    # Distinct feature vectors whose ML probability is remembered
+    ML_CACHE_SIZE = 4096
 
     def __init__(self, weights: Optional[Dict[str, float]] = None):
         if weights is not None:
@@ -82,6 +84,9 @@ class SupplierRiskScorer:
         self._weights = weights or self.WEIGHTS
         self._ml_model = None
         self._ml_trained = False
+        # Supplier metrics rarely change between cycles, so the ML probability
+        # is memoized per feature vector; cleared whenever the model is refit
+        self._ml_cache: Dict[tuple, float] = {}
 
     def score_supplier(self, metrics: SupplierMetrics) -> RiskScore:
         """Calculate composite risk score for a supplier."""
@@ -211,6 +216,7 @@ class SupplierRiskScorer:
         )
         self._ml_model.fit(X_train, y_train)
         self._ml_trained = True
+        self._ml_cache.clear()
 
         accuracy = float(self._ml_model.score(X_test, y_test))
         log.info("ml_risk_trained", accuracy=accuracy, samples=len(y), test_samples=len(y_test))
@@ -304,21 +310,29 @@ class SupplierRiskScorer:
         """Get ML-predicted disruption probability."""
         if not self._ml_model:
             return 0.5
-        features = np.array([[
+        features = (
             m.on_time_rate, m.defect_rate,
             m.lead_time_std / max(m.lead_time_mean, 1),
             m.financial_score, m.capacity_utilization,
             m.recent_incidents, m.years_relationship,
-        ]])
-        prob = self._ml_model.predict_proba(features)[0]
+        )
+        cached = self._ml_cache.get(features)
+        if cached is not None:
+            return cached
+
+        prob = self._ml_model.predict_proba(np.array([features]))[0]
         if len(prob) < 2:
             # Single-class model should not be used — fall back to neutral
-            return 0.5
-        # Multi-class: find the index of the disrupted class (label=1)
-        classes = list(self._ml_model.classes_)
-        if 1 in classes:
-            return float(prob[classes.index(1)])
-        return float(prob[-1])
+            result = 0.5
+        else:
+            # Multi-class: find the index of the disrupted class (label=1)
+            classes = list(self._ml_model.classes_)
+            result = float(prob[classes.index(1)]) if 1 in classes else float(prob[-1])
+
+        if len(self._ml_cache) >= self.ML_CACHE_SIZE:
+            self._ml_cache.clear()
+        self._ml_cache[features] = result
+        return result
 
     def _generate_recommendations(
         self, m: SupplierMetrics, delivery: float, quality: float,
@@ -28,6 +28,8 @@ class MockRuntime:
     products: Optional[List[Product]] = None
     suppliers: Optional[List[Supplier]] = None
     demand_df: Any = None
+    products_by_id: Dict[str, Product] = field(default_factory=dict)
+    suppliers_by_id: Dict[str, Supplier] = field(default_factory=dict)
     forecaster: Any = None
     anomaly_detector: Any = None
     optimizer: Any = None
@@ -70,6 +72,8 @@ def mock_runtime():
             lead_time_mean=5.0,
         ),
     ]
+    rt.products_by_id = {p.product_id: p for p in rt.products}
+    rt.suppliers_by_id = {s.supplier_id: s for s in rt.suppliers}
     return rt
 
 
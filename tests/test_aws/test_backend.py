@@ -154,6 +154,19 @@ class TestAWSBackend:
         # Redshift: should insert KPI snapshot
         aws_backend._redshift.insert_kpi_snapshot.assert_called_once_with(1, snapshot)
 
+    @pytest.mark.asyncio
+    async def test_persist_cycle_kpi_record_matches_model_dump(self, aws_backend):
+        await aws_backend.setup()
+
+        snapshot = KPISnapshot(timestamp=datetime(2025, 1, 15), otif=0.95, mape=None)
+        await aws_backend.persist_cycle(
+            cycle=3, kpi=snapshot, events=[], pos=[], products=[], suppliers=[]
+        )
+
+        records, key = aws_backend._s3.upload_jsonl.call_args.args
+        assert records == [{**snapshot.model_dump(), "cycle": 3}]
+        assert "kpi_snapshots" in key
+
     @pytest.mark.asyncio
     async def test_persist_cycle_skips_empty_events(self, aws_backend):
         await aws_backend.setup()
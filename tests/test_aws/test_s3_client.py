@@ -5,17 +5,19 @@ from __future__ import annotations
 import json
 import sys
 from datetime import timezone  # noqa: F401
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pandas as pd
 import pytest
 
 
 @pytest.fixture
-def mock_boto3():
+def mock_boto3(monkeypatch):
+    # Only swap the boto3 entry: restoring all of sys.modules would evict
+    # pandas' lazily imported Arrow extension types and break later Parquet I/O.
     mock = MagicMock()
-    with patch.dict(sys.modules, {"boto3": mock}):
-        yield mock
+    monkeypatch.setitem(sys.modules, "boto3", mock)
+    return mock
 
 
 @pytest.fixture
@@ -0,0 +1,100 @@
+"""Tests for the synthetic data generator."""
+
+from __future__ import annotations
+
+from chaincommand.data.generator import generate_all_cached, make_rng, make_sim_rng
+
+
+class TestGenerateAllCached:
+    def test_cache_roundtrip(self, tmp_path, monkeypatch):
+        from chaincommand.config import settings
+
+        monkeypatch.setattr(settings, "num_products", 5)
+        monkeypatch.setattr(settings, "num_suppliers", 3)
+        monkeypatch.setattr(settings, "history_days", 30)
+
+        products, suppliers, df = generate_all_cached(7, cache_dir=tmp_path)
+        assert len(list(tmp_path.glob("*.parquet"))) == 1
+        assert df["quantity"].dtype == "float64"
+
+        # Second call must load from disk, not regenerate
+        def fail(*args, **kwargs):
+            raise AssertionError("cache hit must not regenerate")
+
+        monkeypatch.setattr("chaincommand.data.generator.generate_all", fail)
+        products2, suppliers2, df2 = generate_all_cached(7, cache_dir=tmp_path)
+        assert [p.product_id for p in products2] == [p.product_id for p in products]
+        assert [s.products for s in suppliers2] == [s.products for s in suppliers]
+        assert df2["quantity"].tolist() == df["quantity"].tolist()
+
+    def test_no_cache_dir_generates(self, monkeypatch):
+        from chaincommand.config import settings
+
+        monkeypatch.setattr(settings, "num_products", 2)
+        monkeypatch.setattr(settings, "num_suppliers", 2)
+        monkeypatch.setattr(settings, "history_days", 10)
+        monkeypatch.setattr(settings, "data_cache_dir", "")
+
+        products, _, df = generate_all_cached(1)
+        assert len(products) == 2
+        assert len(df) == 2 * 11
+
+
+class TestMakeSimRng:
+    def test_independent_of_generation_stream(self):
+        gen_draws = make_rng(42).random(16)
+        sim_draws = make_sim_rng(42).random(16)
+        assert not (gen_draws == sim_draws).any()
+        assert (make_sim_rng(42).random(16) == sim_draws).all()
+
+    def test_orchestrator_cycle_draws_use_sim_stream(self):
+        from chaincommand.config import settings
+        from chaincommand.orchestrator import ChainCommandOrchestrator
+
+        orch = ChainCommandOrchestrator()
+        cycle_draws = orch._rng.normal(size=16)
+        assert not (cycle_draws == make_rng(settings.random_seed).normal(size=16)).any()
+        assert (cycle_draws == make_sim_rng(settings.random_seed).normal(size=16)).all()
+
+
+class TestAssignSuppliers:
+    def test_each_product_gets_one_to_three_suppliers(self):
+        from chaincommand.data.generator import assign_suppliers, generate_products, generate_suppliers
+
+        rng = make_rng(3)
+        products = generate_products(40, rng=rng)
+        suppliers = assign_suppliers(products, generate_suppliers(10, rng=rng), rng=rng)
+
+        for p in products:
+            n = sum(p.product_id in s.products for s in suppliers)
+            assert 1 <= n <= 3
+        for s in suppliers:
+            assert len(s.products) == len(set(s.products))
+
+    def test_deterministic_for_seed(self):
+        from chaincommand.data.generator import assign_suppliers, generate_products, generate_suppliers
+
+        def run():
+            rng = make_rng(11)
+            products = generate_products(10, rng=rng)
+            return [s.products for s in assign_suppliers(products, generate_suppliers(4, rng=rng), rng=rng)]
+
+        assert run() == run()
+
+
+class TestGenerateDemandHistory:
+    def test_columns_and_dtypes(self):
+        from chaincommand.data.generator import generate_demand_history, generate_products
+
+        rng = make_rng(5)
+        products = generate_products(3, rng=rng)
+        df = generate_demand_history(products, days=20, rng=rng)
+
+        assert len(df) == 3 * 21
+        assert df["quantity"].dtype == "float64"
+        assert df["temperature"].dtype == "float64"
+        assert df["quantity"].to_numpy().flags["C_CONTIGUOUS"]
+        # Stored values are exactly the one-decimal rounding, with no float32 widening error
+        assert (df["quantity"] == df["quantity"].round(1)).all()
+        assert (df["quantity"] >= 0).all()
+        assert df.groupby("product_id")["date"].nunique().eq(21).all()
@@ -47,3 +47,101 @@ class TestEventBusLifecycle:
 
         assert first_task is not None
         assert bus._task is None
+
+
+class TestEventBusDispatch:
+    @pytest.mark.asyncio
+    async def test_failing_handler_is_isolated(self):
+        bus = EventBus()
+        received: list[str] = []
+
+        async def broken(event: SupplyChainEvent) -> None:
+            raise RuntimeError("boom")
+
+        async def ok(event: SupplyChainEvent) -> None:
+            received.append(event.event_type)
+
+        bus.subscribe("tick", broken)
+        bus.subscribe_all(ok)
+        await bus.publish(SupplyChainEvent(event_type="tick", source_agent="test"))
+
+        assert received == ["tick"]
+        assert bus.event_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_raising_handler_is_isolated(self):
+        bus = EventBus()
+        received: list[str] = []
+
+        def broken(event: SupplyChainEvent) -> None:
+            raise RuntimeError("boom")
+
+        async def ok(event: SupplyChainEvent) -> None:
+            received.append(event.event_type)
+
+        bus.subscribe("tick", broken)
+        bus.subscribe("tick", ok)
+        await bus.publish(SupplyChainEvent(event_type="tick", source_agent="test"))
+
+        assert received == ["tick"]
+
+    @pytest.mark.asyncio
+    async def test_publish_many_dispatches_each_event(self):
+        bus = EventBus()
+        typed: list[str] = []
+        wildcard: list[str] = []
+
+        async def on_tick(event: SupplyChainEvent) -> None:
+            typed.append(event.description)
+
+        async def on_any(event: SupplyChainEvent) -> None:
+            wildcard.append(event.description)
+
+        bus.subscribe("tick", on_tick)
+        bus.subscribe_all(on_any)
+        await bus.publish_many([
+            SupplyChainEvent(event_type="tick", source_agent="test", description="a"),
+            SupplyChainEvent(event_type="kpi_threshold_violated", source_agent="test", description="b"),
+            SupplyChainEvent(event_type="tick", source_agent="test", description="c"),
+        ])
+
+        assert typed == ["a", "c"]
+        assert wildcard == ["a", "b", "c"]
+        assert [e.description for e in bus.recent_events] == ["a", "b", "c"]
+        assert [e.description for e in bus.events_tail(2)] == ["b", "c"]
+        assert bus.events_tail(0) == []
+
+    def test_has_subscribers(self):
+        bus = EventBus()
+
+        async def handler(event: SupplyChainEvent) -> None:
+            pass
+
+        assert bus.has_subscribers("tick") is False
+        bus.subscribe("tick", handler)
+        assert bus.has_subscribers("tick") is True
+        assert bus.has_subscribers("other") is False
+        bus.unsubscribe("tick", handler)
+        assert bus.has_subscribers("tick") is False
+        bus.subscribe_all(handler)
+        assert bus.has_subscribers("other") is True
+
+    @pytest.mark.asyncio
+    async def test_wildcard_subscribe_during_dispatch_applies_to_next_publish(self):
+        bus = EventBus()
+        late: list[str] = []
+
+        async def on_late(event: SupplyChainEvent) -> None:
+            late.append(event.description)
+
+        async def on_any(event: SupplyChainEvent) -> None:
+            bus.subscribe_all(on_late)
+
+        bus.subscribe_all(on_any)
+        await bus.publish(SupplyChainEvent(event_type="tick", source_agent="test", description="a"))
+        assert late == []
+        bus.unsubscribe_all(on_any)
+        await bus.publish(SupplyChainEvent(event_type="tick", source_agent="test", description="b"))
+        assert late == ["b"]
+        bus.unsubscribe_all(on_late)
+        assert bus.has_subscribers("tick") is False
@@ -0,0 +1,93 @@
+"""Tests for ProactiveMonitor tick checks."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from chaincommand.data.schemas import OrderStatus, PurchaseOrder, utc_now
+from chaincommand.events.bus import EventBus
+from chaincommand.events.monitor import ProactiveMonitor
+
+
+@pytest.fixture(autouse=True)
+def _reset_runtime():
+    from chaincommand.orchestrator import _reset_runtime_state
+
+    _reset_runtime_state()
+    yield
+    _reset_runtime_state()
+
+
+class TestDeliveryDelay:
+    @pytest.mark.asyncio
+    async def test_only_active_overdue_pos_alert(self, kpi_engine):
+        from chaincommand.orchestrator import _runtime
+
+        overdue = utc_now() - timedelta(days=5)
+        _runtime.purchase_orders.extend([
+            PurchaseOrder(po_id="PO-late", supplier_id="S", product_id="P", quantity=1, unit_cost=1,
+                          status=OrderStatus.SHIPPED, expected_delivery=overdue),
+            PurchaseOrder(po_id="PO-done", supplier_id="S", product_id="P", quantity=1, unit_cost=1,
+                          status=OrderStatus.DELIVERED, expected_delivery=overdue),
+            PurchaseOrder(po_id="PO-future", supplier_id="S", product_id="P", quantity=1, unit_cost=1,
+                          status=OrderStatus.PENDING, expected_delivery=utc_now() + timedelta(days=2)),
+        ])
+
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event)
+
+        bus.subscribe("delivery_delayed", handler)
+        await ProactiveMonitor(bus, kpi_engine).tick()
+
+        assert [e.data["po_id"] for e in received] == ["PO-late"]
+        assert received[0].data["delay_days"] == 5
+
+    @pytest.mark.asyncio
+    async def test_orders_added_while_publishing_do_not_break_the_scan(self, kpi_engine):
+        from chaincommand.orchestrator import _runtime
+
+        overdue = utc_now() - timedelta(days=5)
+        _runtime.purchase_orders.extend(
+            PurchaseOrder(po_id=f"PO-{i}", supplier_id="S", product_id="P", quantity=1, unit_cost=1,
+                          status=OrderStatus.SHIPPED, expected_delivery=overdue)
+            for i in range(2)
+        )
+
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event.data["po_id"])
+            _runtime.purchase_orders.append(
+                PurchaseOrder(supplier_id="S", product_id="P", quantity=1, unit_cost=1)
+            )
+
+        bus.subscribe("delivery_delayed", handler)
+        await ProactiveMonitor(bus, kpi_engine).tick()
+
+        assert received == ["PO-0", "PO-1"]
+
+
+class TestTickHeartbeat:
+    @pytest.mark.asyncio
+    async def test_tick_logged_without_subscribers(self, kpi_engine):
+        bus = EventBus()
+        await ProactiveMonitor(bus, kpi_engine).tick()
+        assert [e.event_type for e in bus.events_tail(1)] == ["tick"]
+
+    @pytest.mark.asyncio
+    async def test_tick_published_with_subscriber(self, kpi_engine):
+        bus = EventBus()
+        ticks = []
+
+        async def handler(event):
+            ticks.append(event.data["tick"])
+
+        bus.subscribe("tick", handler)
+        await ProactiveMonitor(bus, kpi_engine).tick()
+        assert ticks == [1]
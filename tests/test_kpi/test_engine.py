@@ -58,6 +58,17 @@ class TestKPICalculation:
         kpi_engine.calculate_snapshot(sample_products, [], sample_suppliers)
         assert len(kpi_engine.history) == 2
 
+    def test_history_bounded(self, monkeypatch):
+        from chaincommand.config import settings
+        from chaincommand.kpi.engine import KPIEngine
+
+        monkeypatch.setattr(settings, "kpi_max_history", 3)
+        engine = KPIEngine()
+        engine._history.extend(KPISnapshot(otif=v / 10) for v in range(5))
+        assert len(engine.history) == 3
+        assert [s.otif for s in engine.recent(2)] == [0.3, 0.4]
+        assert [s.otif for s in engine.recent(10)] == [0.2, 0.3, 0.4]
+
 
 class TestKPIThresholds:
     def test_no_violations_good_kpi(self, kpi_engine):
@@ -82,3 +93,65 @@ class TestKPIThresholds:
         events = kpi_engine.check_thresholds(snapshot)
         stockout_events = [e for e in events if "Stockout" in e.description]
         assert len(stockout_events) == 1
+
+    def test_min_event_severity_filters_violations(self, kpi_engine, monkeypatch):
+        from chaincommand.config import settings
+        from chaincommand.data.schemas import AlertSeverity
+
+        monkeypatch.setattr(settings, "min_event_severity", AlertSeverity.HIGH)
+        snapshot = KPISnapshot(otif=0.80, fill_rate=0.99, mape=50.0, dsi=90.0)
+        events = kpi_engine.check_thresholds(snapshot)
+        assert [e.data["metric"] for e in events] == ["otif"]
+
+    def test_product_arrays_track_stock_changes(self, kpi_engine, sample_products, sample_suppliers):
+        first = kpi_engine.calculate_snapshot(sample_products, [], sample_suppliers)
+        for p in sample_products:
+            p.current_stock = 0.0
+        second = kpi_engine.calculate_snapshot(sample_products, [], sample_suppliers)
+        assert first.stockout_count == 0
+        assert second.stockout_count == len(sample_products)
+        assert second.total_inventory_value == 0
+
+    def test_product_arrays_rebuilt_for_new_catalog(self, kpi_engine, sample_products, sample_suppliers):
+        kpi_engine.calculate_snapshot(sample_products, [], sample_suppliers)
+        subset = sample_products[:2]
+        snapshot = kpi_engine.calculate_snapshot(subset, [], sample_suppliers)
+        expected = sum(p.current_stock * p.unit_cost for p in subset)
+        assert abs(snapshot.total_inventory_value - round(expected, 2)) < 1.0
+
+
+class TestKPITrend:
+    def test_trend_matches_polyfit_slope(self):
+        import numpy as np
+
+        from chaincommand.kpi.engine import _linear_slope
+
+        x = [0, 1, 3, 4, 7]
+        y = [1.0, 2.5, 2.0, 5.0, 6.0]
+        assert abs(_linear_slope(x, y) - np.polyfit(x, y, 1)[0]) < 1e-12
+
+    def test_improving_otif(self, kpi_engine):
+        kpi_engine._history.extend(KPISnapshot(otif=v) for v in (0.80, 0.85, 0.90, 0.95))
+        assert kpi_engine.get_trend("otif")["trend"] == "improving"
+
+    def test_stable_with_missing_mape(self, kpi_engine):
+        kpi_engine._history.extend(KPISnapshot(mape=v) for v in (None, 10.0, 10.0, 10.0))
+        assert kpi_engine.get_trend("mape")["trend"] == "stable"
+
+
+class TestKPIKernel:
+    def test_kernel_matches_numpy_reference(self):
+        import numpy as np
+
+        from chaincommand.kpi._kernels import _reduce_kpis_numpy, reduce_kpis
+
+        rng = np.random.default_rng(0)
+        stock = np.maximum(rng.uniform(-20, 100, 500), 0.0)
+        demand = rng.uniform(0, 50, 500)
+        demand[::10] = 0.0
+        cost = rng.uniform(1, 9, 500)
+
+        fused = reduce_kpis(stock, demand, cost)
+        reference = _reduce_kpis_numpy(stock, demand, cost)
+        assert fused[3] == reference[3] and fused[6] == reference[6]
+        assert np.allclose(fused, reference)
@@ -19,6 +19,24 @@ class TestAnomalyDetector:
         assert detector._trained is True
         assert len(detector._stats) > 0
 
+    def test_train_stats_match_numpy(self, sample_demand_df):
+        import numpy as np
+
+        short_pid = sample_demand_df["product_id"].iloc[0]
+        df = sample_demand_df.drop(
+            sample_demand_df.index[sample_demand_df["product_id"] == short_pid][5:]
+        )
+        d = AnomalyDetector()
+        d._use_sklearn = False
+        d.train(df)
+
+        assert short_pid not in d._stats
+        pid, stats = next(iter(d._stats.items()))
+        series = df.loc[df["product_id"] == pid, "quantity"].to_numpy(dtype=float)
+        assert stats["mean"] == pytest.approx(np.mean(series))
+        assert stats["std"] == pytest.approx(np.std(series, ddof=1))
+        assert stats["iqr"] == pytest.approx(np.percentile(series, 75) - np.percentile(series, 25))
+
     def test_detect_spike(self, detector):
         # Inject a massive demand spike
         data = {
@@ -38,3 +56,23 @@ class TestAnomalyDetector:
     def test_untrained_returns_empty(self):
         d = AnomalyDetector()
         assert d.detect({"product_id": "P1"}) == []
+
+    def test_detect_batch_matches_per_product_detect(self, detector, sample_products):
+        products = [p.model_copy() for p in sample_products[:10]]
+        products[0].daily_demand_avg = 999.0
+        products[1].current_stock = 0.0
+        products[2].current_stock = products[2].daily_demand_avg * 500
+
+        expected = []
+        for p in products:
+            expected.extend(detector.detect({
+                "product_id": p.product_id,
+                "daily_demand_avg": p.daily_demand_avg,
+                "current_stock": p.current_stock,
+            }))
+
+        batch = detector.detect_batch(products)
+        assert [a.model_dump(exclude={"anomaly_id", "timestamp"}) for a in batch] == [
+            a.model_dump(exclude={"anomaly_id", "timestamp"}) for a in expected
+        ]
+        assert {"demand_spike", "overstock"} <= {a.anomaly_type for a in batch}
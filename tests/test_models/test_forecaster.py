@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from chaincommand.models.forecaster import (
     EnsembleForecaster,
     ForecastModel,
@@ -29,6 +31,29 @@ class TestLSTMForecaster:
             assert p.model_used == "lstm"
             assert p.predicted_demand >= 0
 
+    def test_predict_is_deterministic_per_product(self, sample_demand_df):
+        lstm = LSTMForecaster()
+        lstm.train(sample_demand_df, "PRD-0000")
+        first = lstm.predict("PRD-0000", horizon=20)
+        second = lstm.predict("PRD-0000", horizon=20)
+        assert [p.predicted_demand for p in first] == [p.predicted_demand for p in second]
+        for p in first:
+            assert p.confidence_lower <= p.predicted_demand <= p.confidence_upper
+            assert isinstance(p.predicted_demand, float)
+
+    def test_predict_bands_reused_until_retrained(self, sample_demand_df):
+        lstm = LSTMForecaster()
+        lstm.train(sample_demand_df, "PRD-0000")
+        lstm.predict("PRD-0000", horizon=5)
+        bands = lstm._band_cache[("PRD-0000", 5)][1]
+        lstm.predict("PRD-0000", horizon=5)
+        assert lstm._band_cache[("PRD-0000", 5)][1] is bands
+
+        shifted = sample_demand_df.assign(quantity=sample_demand_df["quantity"] + 100)
+        lstm.train(shifted, "PRD-0000")
+        retrained = lstm.predict("PRD-0000", horizon=5)
+        assert [p.predicted_demand for p in retrained] != bands[0]
+
     def test_train_skip_insufficient_data(self, sample_demand_df):
         lstm = LSTMForecaster()
         lstm.train(sample_demand_df, "NONEXISTENT")
@@ -50,6 +75,17 @@ class TestXGBForecaster:
             assert p.model_used == "xgboost"
             assert p.predicted_demand >= 0
 
+    def test_predict_follows_weekday_pattern(self):
+        xgb = XGBForecaster()
+        xgb._trained["P1"] = {
+            "mean": 3.0, "std": 0.0, "median": 3.0, "trend": 0.0,
+            "weekly_pattern": np.arange(7, dtype=float),
+        }
+        preds = xgb.predict("P1", horizon=9)
+        assert [p.predicted_demand for p in preds] == [
+            float(p.forecast_date.weekday()) for p in preds
+        ]
+
 
 class TestEnsembleForecaster:
     def test_train_all(self, trained_forecaster):
@@ -62,6 +98,14 @@ class TestEnsembleForecaster:
         for p in preds:
             assert p.model_used == "ensemble"
 
+    def test_predictions_survive_validation(self, trained_forecaster):
+        from chaincommand.data.schemas import ForecastResult
+
+        for p in trained_forecaster.predict("PRD-0000", horizon=5):
+            dumped = p.model_dump()
+            assert ForecastResult.model_validate(dumped).model_dump() == dumped
+            assert isinstance(p.mape, float)
+
     def test_weights_sum_to_one(self, trained_forecaster):
         w = trained_forecaster._weights.get("PRD-0000", {"lstm": 0.5, "xgb": 0.5})
         assert abs(w["lstm"] + w["xgb"] - 1.0) < 0.01
@@ -72,20 +116,43 @@ class TestEnsembleForecaster:
         assert "xgb_mape" in acc
         assert "weights" in acc
 
-    def test_compute_mape(self):
-        import numpy as np
+    def test_train_all_matches_per_product_train(self, sample_demand_df):
+        pids = list(sample_demand_df["product_id"].unique()[:3]) + ["NONEXISTENT"]
+        batch = EnsembleForecaster()
+        batch.train_all(sample_demand_df, pids)
+        single = EnsembleForecaster()
+        for pid in pids:
+            single.train(sample_demand_df, pid)
+
+        assert batch._weights == single._weights
+        assert batch._accuracy_cache == single._accuracy_cache
+        assert batch._lstm._trained.keys() == single._lstm._trained.keys()
+        assert "NONEXISTENT" not in batch._xgb._trained
 
+    def test_compute_mape(self):
         actual = np.array([100.0, 200.0, 300.0])
         predicted = [110.0, 190.0, 310.0]
         mape = EnsembleForecaster._compute_mape(actual, predicted)
         assert 0 < mape < 100
 
-    def test_compute_mape_empty(self):
-        import numpy as np
+    def test_compute_mape_skips_zero_demand_days(self):
+        mape = EnsembleForecaster._compute_mape(np.array([0.0, 100.0, 50.0]), np.array([5.0, 110.0, 45.0]))
+        assert mape == 10.0
+        assert EnsembleForecaster._compute_mape(np.zeros(3), [1.0, 2.0, 3.0]) is None
 
+    def test_compute_mape_empty(self):
         assert EnsembleForecaster._compute_mape(np.array([]), []) is None
 
 
+class TestTrendSlope:
+    def test_matches_polyfit(self):
+        from chaincommand.models.forecaster import _trend_slope
+
+        y = np.random.default_rng(0).normal(50.0, 10.0, 200) + 0.3 * np.arange(200)
+        assert abs(_trend_slope(y) - np.polyfit(np.arange(200), y, 1)[0]) < 1e-12
+        assert _trend_slope(np.array([4.0])) == 0.0
+
+
 class TestForecastModelProtocol:
     def test_lstm_satisfies_protocol(self):
         assert isinstance(LSTMForecaster(), ForecastModel)
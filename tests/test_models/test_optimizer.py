@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
 from chaincommand.models.optimizer import DQNOptimizer, GeneticOptimizer, HybridOptimizer
@@ -36,6 +37,22 @@ class TestGeneticOptimizer:
         assert result.recommended_reorder_point > 0
         assert result.recommended_safety_stock > 0
 
+    def test_seeded_runs_are_reproducible(self, product):
+        ga = GeneticOptimizer()
+        first = ga.optimize(product, [], seed=7)
+        second = ga.optimize(product, [], seed=7)
+        assert first.model_dump(exclude={"timestamp"}) == second.model_dump(exclude={"timestamp"})
+
+    def test_compiled_kernel_matches_python(self):
+        from chaincommand.models._kernels import _ga_evolve_loop, ga_evolve
+
+        pop = np.random.default_rng(0).uniform(10.0, 500.0, (20, 3))
+        args = (15, 20.0, 5.0, 7.0, 10.0, 25.0, 100.0, 0.25, 1.65, 0.1, 5.0, 0.1)
+        best_a, fit_a = ga_evolve(pop.copy(), *args, np.random.default_rng(1))
+        best_b, fit_b = _ga_evolve_loop(pop.copy(), *args, np.random.default_rng(1))
+        np.testing.assert_allclose(best_a, best_b)
+        assert fit_a == pytest.approx(fit_b)
+
 
 class TestDQNOptimizer:
     def test_train_and_decide(self, product):
@@ -45,6 +62,34 @@ class TestDQNOptimizer:
         result = dqn.decide(product)
         assert result.product_id == "PRD-opt01"
 
+    def test_seeded_training_is_reproducible(self, product):
+        first, second = DQNOptimizer(), DQNOptimizer()
+        first.train(product, seed=3)
+        second.train(product, seed=3)
+        np.testing.assert_array_equal(first._q_tables["PRD-opt01"], second._q_tables["PRD-opt01"])
+        qty = first.decide(product).recommended_order_qty
+        assert qty in {0.0, product.min_order_qty * 1.0, product.min_order_qty * 2.0, product.min_order_qty * 4.0}
+
+    def test_compiled_kernel_matches_python(self):
+        from chaincommand.models._kernels import _dqn_train_loop, dqn_train
+
+        rng = np.random.default_rng(2)
+        explore = rng.random((50, 30)) < 0.3
+        actions = rng.integers(4, size=(50, 30))
+        demands = rng.uniform(0.0, 40.0, (50, 30))
+        order_qtys = np.array([0.0, 100.0, 200.0, 400.0])
+        args = (120.0, 40.0, 90.0, 25.0, 10.0)
+
+        q, visited = np.zeros((4, 4)), np.zeros(4, dtype=bool)
+        dqn_train(q, visited, *args, order_qtys, explore, actions, demands, 0.1, 0.95)
+        q_rows, seen = [[0.0] * 4 for _ in range(4)], [False] * 4
+        _dqn_train_loop(
+            q_rows, seen, *args, order_qtys.tolist(), explore.tolist(), actions.tolist(),
+            demands.tolist(), 0.1, 0.95,
+        )
+        np.testing.assert_allclose(q, q_rows)
+        assert visited.tolist() == seen
+
     def test_untrained_fallback(self, product):
         dqn = DQNOptimizer()
         result = dqn.decide(product)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -23,10 +24,13 @@ def _reset_runtime():
 class TestOrchestratorInitializeShutdown:
     @pytest.mark.asyncio
     async def test_initialize_is_idempotent(self, sample_products, sample_suppliers, sample_demand_df):
-        from chaincommand.orchestrator import ChainCommandOrchestrator
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime
 
+        seen_during_training: list = []
         mock_forecaster = MagicMock()
+        mock_forecaster.train_all.side_effect = lambda *a: seen_during_training.append(_runtime.forecaster)
         mock_anomaly = MagicMock()
+        mock_anomaly.train.side_effect = lambda df: seen_during_training.append(_runtime.anomaly_detector)
         mock_kpi_engine = MagicMock()
         mock_kpi_engine.calculate_snapshot.return_value = KPISnapshot()
         mock_bom = MagicMock()
@@ -57,18 +61,21 @@ class TestOrchestratorInitializeShutdown:
              patch("chaincommand.models.forecaster.EnsembleForecaster", return_value=mock_forecaster), \
              patch("chaincommand.models.anomaly_detector.AnomalyDetector", return_value=mock_anomaly), \
              patch("chaincommand.models.optimizer.HybridOptimizer", return_value=MagicMock()), \
-             patch("chaincommand.events.bus.EventBus", return_value=mock_event_bus), \
-             patch("chaincommand.events.monitor.ProactiveMonitor", return_value=mock_monitor), \
+             patch("chaincommand.orchestrator.EventBus", return_value=mock_event_bus), \
+             patch("chaincommand.orchestrator.ProactiveMonitor", return_value=mock_monitor), \
              patch("chaincommand.kpi.engine.KPIEngine", return_value=mock_kpi_engine), \
-             patch("chaincommand.bom.BOMManager", return_value=mock_bom), \
+             patch("chaincommand.orchestrator.BOMManager", return_value=mock_bom), \
              patch("chaincommand.rl.RLInventoryPolicy", return_value=mock_rl_policy), \
              patch("chaincommand.risk.SupplierRiskScorer", return_value=mock_risk), \
-             patch("chaincommand.aws.get_backend", return_value=mock_backend):
+             patch("chaincommand.orchestrator.get_backend", return_value=mock_backend):
             orch = ChainCommandOrchestrator()
             await orch.initialize()
             await orch.initialize()
 
         assert orch._initialized is True
+        # Models are only published once training has finished
+        assert seen_during_training == [None, None]
+        assert mock_anomaly.train.call_args.args[0] is not sample_demand_df
         mock_event_bus.start.assert_awaited_once()
         mock_backend.setup.assert_awaited_once()
         mock_backend.persist_demand_history.assert_awaited_once()
@@ -98,7 +105,7 @@ class TestOrchestratorInitializeShutdown:
         await orch.shutdown()
 
         assert orchestrator_module._runtime.products is None
-        assert orchestrator_module._runtime.purchase_orders == []
+        assert len(orchestrator_module._runtime.purchase_orders) == 0
         assert orchestrator_module._runtime.pending_approvals == {}
         assert orchestrator_module._runtime.last_cycle_results == {}
         assert orch._initialized is False
@@ -112,3 +119,340 @@ class TestOrchestratorInitializeShutdown:
 
         orch = ChainCommandOrchestrator()
         assert await orch.start_loop() is False
+
+    def test_runtime_state_rejects_unknown_attributes(self):
+        from chaincommand.orchestrator import _runtime
+
+        with pytest.raises(AttributeError):
+            _runtime.procucts = []
+
+    def test_demand_arrays_rebuilt_only_for_new_catalog(self, sample_products):
+        from chaincommand.orchestrator import ChainCommandOrchestrator
+
+        orch = ChainCommandOrchestrator()
+        avg, std = orch._demand_arrays(sample_products)
+        assert orch._demand_arrays(sample_products)[0] is avg
+        assert std.tolist() == [abs(p.daily_demand_std) for p in sample_products]
+        subset_avg, _ = orch._demand_arrays(sample_products[:2])
+        assert subset_avg.tolist() == [p.daily_demand_avg for p in sample_products[:2]]
+
+    @pytest.mark.asyncio
+    async def test_analysis_steps_merge_in_pipeline_order(self, sample_products, sample_suppliers):
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        _runtime.rl_policy = MagicMock()
+        _runtime.rl_policy.decide.return_value = SimpleNamespace(action="none", order_quantity=0.0, method="mock")
+
+        orch = ChainCommandOrchestrator()
+        results = await orch.run_cycle()
+        keys = list(results)
+        assert keys[0] == "cycle"
+        assert keys.index("rl_decisions") < keys.index("kpi")
+        assert results["rl_decisions"] == min(10, len(sample_products))
+
+    def test_reset_keeps_returned_cycle_results(self):
+        from chaincommand.orchestrator import _reset_runtime_state, _runtime
+
+        results = {"cycle": 1, "kpi": {}}
+        _runtime.last_cycle_results = results
+        _reset_runtime_state()
+        assert results == {"cycle": 1, "kpi": {}}
+        assert _runtime.last_cycle_results == {}
+
+    def test_get_orchestrator_returns_class_singleton(self, monkeypatch):
+        from chaincommand.orchestrator import ChainCommandOrchestrator, get_orchestrator
+
+        monkeypatch.setattr(ChainCommandOrchestrator, "_instance", None)
+        orch = get_orchestrator()
+        assert ChainCommandOrchestrator.instance() is orch
+        assert get_orchestrator() is orch
+
+    @pytest.mark.asyncio
+    async def test_analysis_steps_respect_concurrency_cap(self, monkeypatch):
+        import threading
+        import time
+
+        from chaincommand.config import settings
+        from chaincommand.orchestrator import ChainCommandOrchestrator
+
+        monkeypatch.setattr(settings, "max_step_concurrency", 2)
+        orch = ChainCommandOrchestrator()
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def step(products, suppliers):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return {}
+
+        timings: dict[str, float] = {}
+        await asyncio.gather(*(orch._run_step(step, [], [], timings) for _ in range(6)))
+        assert peak == 2
+        assert timings["step"] >= 20.0
+
+    @pytest.mark.asyncio
+    async def test_run_loop_period_does_not_drift_with_cycle_time(self, monkeypatch):
+        from chaincommand.config import settings
+        from chaincommand.orchestrator import ChainCommandOrchestrator
+
+        monkeypatch.setattr(settings, "event_tick_seconds", 0.05)  # 0.1s period at speed 1
+        loop = asyncio.get_running_loop()
+        orch = ChainCommandOrchestrator()
+        starts: list[float] = []
+
+        async def slow_cycle():
+            starts.append(loop.time())
+            if len(starts) == 4:
+                orch._running = False
+            await asyncio.sleep(0.06)
+            return {}
+
+        orch.run_cycle = slow_cycle  # type: ignore[method-assign]
+        await orch.run_loop()
+        # Sleeping a full interval after each cycle would give 0.16s spacing
+        assert (starts[-1] - starts[0]) / 3 < 0.13
+
+    def test_trim_purchase_orders_keeps_open_orders(self, monkeypatch):
+        from chaincommand.config import settings
+        from chaincommand.data.schemas import OrderStatus, PurchaseOrder
+        from chaincommand.orchestrator import _runtime
+
+        monkeypatch.setattr(settings, "max_po_history", 4)
+        statuses = [
+            OrderStatus.PENDING, OrderStatus.DELIVERED, OrderStatus.SHIPPED,
+            OrderStatus.CANCELLED, OrderStatus.APPROVED, OrderStatus.DELIVERED,
+        ]
+        orders = [
+            PurchaseOrder(
+                po_id=f"PO-{i}", supplier_id="SUP-1", product_id="PRD-1", quantity=1, unit_cost=1.0, status=st,
+            )
+            for i, st in enumerate(statuses)
+        ]
+        _runtime.purchase_orders.extend(orders)
+
+        _runtime.trim_purchase_orders()
+        # The two oldest terminal orders go; open orders are never touched
+        assert [po.po_id for po in _runtime.purchase_orders] == ["PO-0", "PO-2", "PO-4", "PO-5"]
+
+        monkeypatch.setattr(settings, "max_po_history", 2)
+        _runtime.trim_purchase_orders()
+        # Only open orders are left, so they stay even above the cap
+        assert [po.po_id for po in _runtime.purchase_orders] == ["PO-0", "PO-2", "PO-4"]
+
+    @pytest.mark.asyncio
+    async def test_run_cycle_binds_cycle_to_log_context(self):
+        from structlog.contextvars import get_contextvars
+
+        from chaincommand.orchestrator import ChainCommandOrchestrator
+
+        orch = ChainCommandOrchestrator()
+
+        async def capture():
+            return dict(get_contextvars())
+
+        orch._run_cycle_locked = capture  # type: ignore[method-assign]
+        assert await orch.run_cycle() == {"cycle": 1}
+        assert await orch.run_cycle() == {"cycle": 2}
+        assert "cycle" not in get_contextvars()
+
+    @pytest.mark.asyncio
+    async def test_failing_analysis_step_does_not_abort_cycle(self, sample_products, sample_suppliers, monkeypatch):
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        _runtime.rl_policy = MagicMock()
+        _runtime.rl_policy.decide.return_value = SimpleNamespace(action="none", order_quantity=0.0, method="mock")
+
+        def broken(products, suppliers):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(ChainCommandOrchestrator, "_step_allocations", staticmethod(broken))
+        results = await ChainCommandOrchestrator().run_cycle()
+        assert "allocations" not in results
+        assert results["rl_decisions"] == min(10, len(sample_products))
+        assert "kpi" in results
+
+    @pytest.mark.asyncio
+    async def test_due_purchase_order_restocks_indexed_product(self, sample_products, sample_suppliers):
+        from datetime import UTC, datetime, timedelta
+
+        from chaincommand.data.schemas import OrderStatus, PurchaseOrder
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        assert _runtime.products_by_id[sample_products[0].product_id] is sample_products[0]
+        _runtime.kpi_engine = KPIEngine()
+        po = PurchaseOrder(
+            supplier_id=sample_suppliers[0].supplier_id,
+            product_id=sample_products[0].product_id,
+            quantity=100,
+            unit_cost=1.0,
+            total_cost=100.0,
+            created_at=datetime.now(UTC) - timedelta(days=60),
+        )
+        _runtime.purchase_orders.append(po)
+
+        await ChainCommandOrchestrator().run_cycle()
+        assert po.status == OrderStatus.DELIVERED
+
+    @pytest.mark.asyncio
+    async def test_persist_runs_in_background_and_is_drained_on_shutdown(self, sample_products, sample_suppliers):
+        from datetime import UTC, datetime, timedelta
+
+        from chaincommand.data.schemas import OrderStatus, PurchaseOrder
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        po = PurchaseOrder(
+            supplier_id=sample_suppliers[0].supplier_id,
+            product_id=sample_products[0].product_id,
+            quantity=10,
+            unit_cost=1.0,
+            created_at=datetime.now(UTC) - timedelta(days=60),
+        )
+        _runtime.purchase_orders.append(po)
+        release = asyncio.Event()
+        persisted: list = []
+
+        async def slow_persist(**kwargs):
+            await release.wait()
+            persisted.append(kwargs)
+
+        _runtime.backend = MagicMock()
+        _runtime.backend.persist_cycle = slow_persist
+        _runtime.backend.teardown = AsyncMock()
+
+        orch = ChainCommandOrchestrator()
+        orch._initialized = True
+        await orch.run_cycle()
+        assert persisted == [] and len(orch._persist_tasks) == 1
+
+        release.set()
+        await orch.shutdown()
+        assert not orch._persist_tasks
+        # The upload saw the orders as they were when the cycle persisted them
+        assert persisted[0]["pos"][0].status == OrderStatus.PENDING
+        assert po.status == OrderStatus.DELIVERED
+        assert persisted[0]["products"] == [p.product_id for p in sample_products]
+
+    @pytest.mark.asyncio
+    async def test_persist_sends_only_new_or_changed_orders(self, sample_products, sample_suppliers):
+        from datetime import UTC, datetime, timedelta
+
+        from chaincommand.data.schemas import OrderStatus, PurchaseOrder
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        due = PurchaseOrder(
+            po_id="PO-due", supplier_id=sample_suppliers[0].supplier_id, product_id=sample_products[0].product_id,
+            quantity=10, unit_cost=1.0, created_at=datetime.now(UTC) - timedelta(days=60),
+        )
+        open_po = PurchaseOrder(
+            po_id="PO-open", supplier_id=sample_suppliers[0].supplier_id, product_id=sample_products[0].product_id,
+            quantity=10, unit_cost=1.0, expected_delivery=datetime.now(UTC) + timedelta(days=30),
+        )
+        _runtime.purchase_orders.extend([due, open_po])
+        persisted: list = []
+
+        async def persist(**kwargs):
+            persisted.append([(po.po_id, po.status) for po in kwargs["pos"]])
+
+        _runtime.backend = MagicMock()
+        _runtime.backend.persist_cycle = persist
+        _runtime.backend.teardown = AsyncMock()
+
+        orch = ChainCommandOrchestrator()
+        orch._initialized = True
+        for _ in range(3):
+            await orch.run_cycle()
+        await orch.shutdown()
+
+        assert persisted == [
+            [("PO-due", OrderStatus.PENDING), ("PO-open", OrderStatus.PENDING)],
+            [("PO-due", OrderStatus.DELIVERED)],
+            [],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_persist_keeps_one_upload_in_flight(self, sample_products, sample_suppliers):
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        active = 0
+        peak = 0
+        cycles: list[int] = []
+
+        async def slow_persist(**kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            cycles.append(kwargs["cycle"])
+            active -= 1
+
+        _runtime.backend = MagicMock()
+        _runtime.backend.persist_cycle = slow_persist
+        _runtime.backend.teardown = AsyncMock()
+
+        orch = ChainCommandOrchestrator()
+        orch._initialized = True
+        for _ in range(3):
+            await orch.run_cycle()
+            assert len([t for t in orch._persist_tasks if not t.done()]) <= 1
+        await orch.shutdown()
+        assert peak == 1
+        assert cycles == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_null_backend_skips_persist_task(self, sample_products, sample_suppliers):
+        from chaincommand.aws import NullBackend
+        from chaincommand.kpi.engine import KPIEngine
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _runtime, _set_catalog
+
+        _set_catalog(sample_products, sample_suppliers)
+        _runtime.kpi_engine = KPIEngine()
+        _runtime.backend = NullBackend()
+
+        orch = ChainCommandOrchestrator()
+        orch._initialized = True
+        await orch.run_cycle()
+        assert not orch._persist_tasks
+
+    def test_suppliers_by_product_follows_catalog_order(self, sample_suppliers):
+        from chaincommand.orchestrator import _suppliers_by_product
+
+        for i, s in enumerate(sample_suppliers):
+            s.products = [f"PRD-{j:04d}" for j in range(i, i + 3)] + [f"PRD-{i:04d}"]
+        by_product = _suppliers_by_product(sample_suppliers, {"PRD-0000", "PRD-0002"})
+        assert set(by_product) == {"PRD-0000", "PRD-0002"}
+        for product_id, suppliers in by_product.items():
+            assert suppliers == [s for s in sample_suppliers if product_id in s.products]
+        assert _suppliers_by_product(sample_suppliers, set()) == {}
+
+    def test_allocation_step_uses_its_supplier_argument(self, sample_products, sample_suppliers):
+        from chaincommand.orchestrator import ChainCommandOrchestrator, _set_catalog
+
+        _set_catalog(None, None)
+        product = sample_products[0]
+        product.current_stock = 0
+        sample_suppliers[0].products = [product.product_id]
+
+        result = ChainCommandOrchestrator._step_allocations([product], sample_suppliers)
+        assert [a["product_id"] for a in result["allocations"]] == [product.product_id]
@@ -113,3 +113,14 @@ class TestSupplierRiskScorer:
         # Scores should differ slightly (ML adjustment)
         # Both should still indicate low risk for a good supplier
         assert score_with_ml.overall_score < 0.5
+
+    def test_ml_prediction_memoized_until_retrained(self, scorer, good_supplier):
+        from unittest.mock import patch
+
+        scorer.train_ml_model(scorer.generate_synthetic_history(n_suppliers=100))
+        first = scorer.score_supplier(good_supplier)
+        with patch.object(scorer._ml_model, "predict_proba", side_effect=AssertionError("not cached")):
+            assert scorer.score_supplier(good_supplier).overall_score == first.overall_score
+
+        scorer.train_ml_model(scorer.generate_synthetic_history(n_suppliers=100, seed=7), seed=7)
+        assert not scorer._ml_cache